@@ -1,5 +1,4 @@
 import os
-import json
 from typing import Optional
 
 from loguru import logger
@@ -7,6 +6,7 @@ from dotenv import load_dotenv
 from datetime import datetime
 
 import asyncpg
+import orjson
 from asyncpg import Pool
 
 load_dotenv()
@@ -689,26 +689,6 @@ queries = {
         ON CONFLICT (osv_id, alias)
         DO NOTHING;
     """,
-    "insert_osv_reference": """
-        INSERT INTO osv_references
-            (osv_id, ref_type, url)
-        VALUES ($1, $2, $3);
-    """,
-    "insert_osv_severity": """
-        INSERT INTO osv_severity
-            (osv_id, severity_type, score)
-        VALUES ($1, $2, $3);
-    """,
-    "insert_osv_affected": """
-        INSERT INTO osv_affected
-            (osv_id, package_ecosystem, package_name, package_purl, ranges, versions, ecosystem_specific, database_specific)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8);
-    """,
-    "insert_osv_credit": """
-        INSERT INTO osv_credits
-            (osv_id, name, contact, credit_type)
-        VALUES ($1, $2, $3, $4);
-    """,
     "delete_osv_by_id": """
         DELETE FROM osv_vulnerabilities WHERE osv_id = $1;
     """,
@@ -732,6 +712,12 @@ queries = {
         WHERE
             osv_id = $1;
     """,
+    "get_osv_modified": """
+        SELECT
+            osv_id, modified
+        FROM
+            osv_vulnerabilities;
+    """,
     "get_osvs": """
         SELECT
             v.osv_id,
@@ -991,9 +977,65 @@ queries = {
     """,
 }
 
+# Column order of the OSV child tables, bulk loaded with COPY after the
+# previous rows of the entry have been deleted
+copy_columns = {
+    "osv_references": ["osv_id", "ref_type", "url"],
+    "osv_severity": ["osv_id", "severity_type", "score"],
+    "osv_affected": [
+        "osv_id",
+        "package_ecosystem",
+        "package_name",
+        "package_purl",
+        "ranges",
+        "versions",
+        "ecosystem_specific",
+        "database_specific",
+    ],
+    "osv_credits": ["osv_id", "name", "contact", "credit_type"],
+}
+
 _conn_pool = None
 
 
+# Binary jsonb values are the JSON text prefixed with a format version byte
+_JSONB_VERSION = b"\x01"
+
+
+def _encode_jsonb(value) -> bytes:
+    """
+    Encodes a jsonb parameter.
+
+    Callers pass Python values (dicts, lists, strings, numbers), never JSON text they
+    serialized themselves: every value goes through orjson.dumps here, so a str is
+    stored as a JSON string.
+    """
+    return _JSONB_VERSION + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes):
+    """
+    Decodes a jsonb column into the Python value it was stored from.
+    """
+    return orjson.loads(data[1:])
+
+
+async def _init_connection(conn) -> None:
+    """
+    Sets up a new pooled connection once, so queries do not pay for it on every acquire.
+
+    The jsonb codec uses the binary format because COPY (copy_records_to_table)
+    needs a binary encoder for every column it loads.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+
+
 async def create_pool() -> Pool:
     return await asyncpg.create_pool(
         host=_db_host,
@@ -1002,6 +1044,7 @@ async def create_pool() -> Pool:
         password=_db_pass,
         min_size=_min_conn,
         max_size=_max_conn,
+        init=_init_connection,
     )
 
 
@@ -1128,9 +1171,6 @@ async def insert_vulnerabilities(data_cve: list, data_cvss: list) -> dict:
     try:
         async with pool.acquire() as conn:
             async with conn.transaction():
-                await conn.set_type_codec(
-                    "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-                )
                 await conn.executemany(queries["insert_cve"], data_cve)
                 await conn.executemany(queries["insert_cvss"], data_cvss)
     except asyncpg.PostgresError as e:
@@ -1678,9 +1718,6 @@ async def compare_image_versions(
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             q = await conn.fetch(
                 queries["compare_image_versions"],
                 team,
@@ -2449,44 +2486,37 @@ async def insert_osv_data(
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            if data_vuln:
-                async with conn.transaction():
+            # One transaction for the whole entry: a failure rolls back the
+            # upsert and the deletes too, so modified never gets ahead of the
+            # child rows
+            async with conn.transaction():
+                if data_vuln:
                     await conn.executemany(
                         queries["insert_osv_vulnerability"], data_vuln
                     )
 
-            if data_aliases:
-                async with conn.transaction():
+                if data_aliases:
                     await conn.executemany(queries["insert_osv_alias"], data_aliases)
 
-            # For updates, delete existing child records and re-insert
-            # This ensures data consistency when OSV entries are updated
-            if osv_id:
-                await conn.execute(queries["delete_osv_references"], osv_id)
-                await conn.execute(queries["delete_osv_severity"], osv_id)
-                await conn.execute(queries["delete_osv_affected"], osv_id)
-                await conn.execute(queries["delete_osv_credits"], osv_id)
-
-            # Insert child records
-            if data_refs:
-                async with conn.transaction():
-                    await conn.executemany(queries["insert_osv_reference"], data_refs)
-
-            if data_severity:
-                async with conn.transaction():
-                    await conn.executemany(
-                        queries["insert_osv_severity"], data_severity
-                    )
-
-            if data_affected:
-                async with conn.transaction():
-                    await conn.executemany(
-                        queries["insert_osv_affected"], data_affected
-                    )
-
-            if data_credits:
-                async with conn.transaction():
-                    await conn.executemany(queries["insert_osv_credit"], data_credits)
+                # For updates, delete existing child records and re-insert
+                # This ensures data consistency when OSV entries are updated
+                if osv_id:
+                    await conn.execute(queries["delete_osv_references"], osv_id)
+                    await conn.execute(queries["delete_osv_severity"], osv_id)
+                    await conn.execute(queries["delete_osv_affected"], osv_id)
+                    await conn.execute(queries["delete_osv_credits"], osv_id)
+
+                # Insert child records
+                for table, records in (
+                    ("osv_references", data_refs),
+                    ("osv_severity", data_severity),
+                    ("osv_affected", data_affected),
+                    ("osv_credits", data_credits),
+                ):
+                    if records:
+                        await conn.copy_records_to_table(
+                            table, records=records, columns=copy_columns[table]
+                        )
 
             logger.info(
                 f"Inserted OSV {osv_id}: {len(data_aliases)} aliases, {len(data_refs)} refs, "
@@ -2516,9 +2546,6 @@ async def get_osv_by_id(osv_id: str) -> dict:
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             q = await conn.fetchrow(queries["get_osv_by_id"], osv_id)
 
         if not q:
@@ -2547,6 +2574,29 @@ async def get_osv_by_id(osv_id: str) -> dict:
     return res
 
 
+async def get_osv_modified() -> dict:
+    """
+    Get the modified timestamp of every OSV vulnerability stored in the database.
+
+    Returns:
+        dict structure with 'status' and 'result'
+        result is a dict mapping osv_id to its modified timestamp
+    """
+    res = {"status": False, "result": {}}
+    pool = await get_pool()
+    try:
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(queries["get_osv_modified"])
+        res["status"] = True
+        res["result"] = {row[0]: row[1] for row in rows}
+        logger.debug(f"Got modified timestamps for {len(res['result'])} OSV entries")
+    except asyncpg.PostgresError as e:
+        logger.error(f"PSQL error getting OSV modified timestamps: {e}")
+    except Exception as e:
+        logger.error(f"Error getting OSV modified timestamps: {e}")
+    return res
+
+
 async def get_osv_by_ilike_id(osv_id: str) -> dict:
     """
     Get OSV vulnerabilities by OSV ID pattern with severity data.
@@ -2566,9 +2616,6 @@ async def get_osv_by_ilike_id(osv_id: str) -> dict:
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             rows = await conn.fetch(queries["get_osvs"], osv_id)
 
         if not rows:
@@ -2673,9 +2720,6 @@ async def insert_vulnerability_sca(
         vuln_id = vuln.get("vuln_id", "")
 
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             await conn.execute(
                 queries["insert_vulnerability_sca"],
                 scanner,
@@ -2691,21 +2735,21 @@ async def insert_vulnerability_sca(
                 vuln.get("affected_component", ""),
                 vuln.get("affected_version", ""),
                 vuln.get("affected_path", ""),
-                json.dumps(cvss),
-                json.dumps(epss),
-                json.dumps(vuln.get("urls", [])),
-                json.dumps(vuln.get("cwes", [])),
-                json.dumps(vuln.get("fix", {})),
-                json.dumps(vuln.get("related_vulnerabilities", [])),
+                cvss,
+                epss,
+                vuln.get("urls", []),
+                vuln.get("cwes", []),
+                vuln.get("fix", {}),
+                vuln.get("related_vulnerabilities", []),
                 # Universal format fields
                 vuln.get("purl"),
                 vuln.get("namespace"),
                 risk_score,
-                json.dumps(vuln.get("cpes", [])),
-                json.dumps(vuln.get("licenses", [])),
-                json.dumps(vuln.get("locations", [])),
-                json.dumps(vuln.get("upstreams", [])),
-                json.dumps(vuln.get("match_details", [])),
+                vuln.get("cpes", []),
+                vuln.get("licenses", []),
+                vuln.get("locations", []),
+                vuln.get("upstreams", []),
+                vuln.get("match_details", []),
             )
         logger.debug(
             f"Inserted vulnerability {vuln_id} for image {image_name}:{image_version}"
@@ -2768,21 +2812,21 @@ async def insert_vulnerabilities_sca_batch(
                     v.get("affected_component", ""),
                     v.get("affected_version", ""),
                     v.get("affected_path", ""),
-                    json.dumps(cvss),
-                    json.dumps(epss),
-                    json.dumps(v.get("urls", [])),
-                    json.dumps(v.get("cwes", [])),
-                    json.dumps(v.get("fix", {})),
-                    json.dumps(v.get("related_vulnerabilities", [])),
+                    cvss,
+                    epss,
+                    v.get("urls", []),
+                    v.get("cwes", []),
+                    v.get("fix", {}),
+                    v.get("related_vulnerabilities", []),
                     # Universal format fields
                     v.get("purl"),
                     v.get("namespace"),
                     risk_score,
-                    json.dumps(v.get("cpes", [])),
-                    json.dumps(v.get("licenses", [])),
-                    json.dumps(v.get("locations", [])),
-                    json.dumps(v.get("upstreams", [])),
-                    json.dumps(v.get("match_details", [])),
+                    v.get("cpes", []),
+                    v.get("licenses", []),
+                    v.get("locations", []),
+                    v.get("upstreams", []),
+                    v.get("match_details", []),
                 )
             )
 
@@ -2823,9 +2867,6 @@ async def get_vulnerabilities_sca_by_image(
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             rows = await conn.fetch(
                 queries["get_vulnerabilities_sca_by_image"],
                 image_name,
@@ -2891,9 +2932,6 @@ async def get_vulnerability_sca_by_id(vuln_id: str, team: str) -> dict:
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             rows = await conn.fetch(
                 queries["get_vulnerability_sca_by_id"],
                 vuln_id,
@@ -3073,13 +3111,13 @@ async def insert_vulnerabilities_sast_batch(
                     f.get("code_snippet", ""),
                     f.get("suggested_fix", ""),
                     f.get("fingerprint", ""),
-                    json.dumps(f.get("cwes", [])),
-                    json.dumps(f.get("owasp", [])),
-                    json.dumps(f.get("refs", [])),
+                    f.get("cwes", []),
+                    f.get("owasp", []),
+                    f.get("refs", []),
                     f.get("category", ""),
-                    json.dumps(f.get("subcategory", [])),
-                    json.dumps(f.get("technology", [])),
-                    json.dumps(f.get("vulnerability_class", [])),
+                    f.get("subcategory", []),
+                    f.get("technology", []),
+                    f.get("vulnerability_class", []),
                     f.get("impact", ""),
                     f.get("likelihood", ""),
                     f.get("engine_kind", ""),
@@ -3117,9 +3155,6 @@ async def get_vulnerabilities_sast_by_repo(repo: str, product: str, team: str) -
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             rows = await conn.fetch(
                 queries["get_vulnerabilities_sast_by_repo"], repo, product, team
             )
@@ -3154,9 +3189,6 @@ async def get_vulnerabilities_sast_by_product(product: str, team: str) -> dict:
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             rows = await conn.fetch(
                 queries["get_vulnerabilities_sast_by_product"], product, team
             )
@@ -3190,9 +3222,6 @@ async def get_vulnerabilities_sast_by_team(team: str) -> dict:
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             rows = await conn.fetch(queries["get_vulnerabilities_sast_by_team"], team)
 
         if rows:
@@ -3223,9 +3252,6 @@ async def get_vulnerability_sast_by_rule(rule_id: str, team: str) -> dict:
     pool = await get_pool()
     try:
         async with pool.acquire() as conn:
-            await conn.set_type_codec(
-                "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-            )
             rows = await conn.fetch(
                 queries["get_vulnerability_sast_by_rule"], rule_id, team
             )
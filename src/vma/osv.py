@@ -1,20 +1,43 @@
 from loguru import logger
 
 import os
+import re
 import asyncio
-import json
 import shutil
 from google.cloud import storage
 from google.cloud.exceptions import NotFound, Forbidden
 import zipfile
-import csv
+from contextlib import aclosing
 from datetime import datetime
-from io import StringIO
+from functools import lru_cache
+from pathlib import Path
 
 import aiofiles
+import orjson
 
 from vma import connector as c
 
+_osv_workers = int(os.getenv("OSV_WORKERS") or 8)
+_osv_prefetch = int(os.getenv("OSV_PREFETCH") or 8)
+
+# Cheap structural check for modified_id.csv rows (id,modified) before any parsing.
+# Whitespace around the fields is tolerated, and fractional seconds are limited to the
+# 3 or 6 digits datetime.fromisoformat accepts before Python 3.11
+_CSV_ROW_RE = re.compile(
+    r"^\s*([^,\s]+)\s*,\s*(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{3}|\.\d{6})?Z)\s*$"
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> datetime:
+    """
+    Parses an OSV RFC 3339 timestamp. Many entries share the same timestamp, so results are cached.
+    """
+    # fromisoformat does not accept the "Z" suffix before Python 3.11
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
 
 async def download_gcs_bucket(prefix: str, name: str, dst: str) -> str:
     """
@@ -61,29 +84,46 @@ async def download_gcs_bucket(prefix: str, name: str, dst: str) -> str:
     return result
 
 
-async def unzip_file(name):
-    """
-    Extract zip file using thread pool (CPU-bound operation).
+async def decompress_iter(zf, names, prefetch: int = _osv_prefetch):
     """
-    extracted = "osv/all/extracted/"
-
-    # Run CPU-bound extraction in thread pool
-    def _extract():
-        with zipfile.ZipFile(name, "r") as zip_ref:
-            zip_ref.extractall(extracted)
-        return extracted
+    Yields (name, content) for the given members of an open zip file.
 
-    result = await asyncio.to_thread(_extract)
-    logger.debug(f"File {name} unziped in {extracted}")
-    return result
+    Members are decompressed in a worker thread while the caller handles the previous
+    ones; at most `prefetch` decompressed members are kept waiting. Closing the generator
+    (e.g. with contextlib.aclosing) waits for a read in flight, so the zip file can be
+    closed right after.
+    """
+    queue = asyncio.Queue(maxsize=prefetch)
+
+    async def reader():
+        for name in names:
+            read = asyncio.ensure_future(asyncio.to_thread(zf.read, name))
+            try:
+                content = await asyncio.shield(read)
+            except asyncio.CancelledError:
+                # The thread cannot be interrupted; let it finish before the zip is closed
+                await asyncio.wait([read])
+                raise
+            except Exception as e:
+                logger.error(f"Error decompressing {name}: {e}")
+                continue
+            await queue.put((name, content))
+        await queue.put(None)
+
+    task = asyncio.create_task(reader())
+    try:
+        while (item := await queue.get()) is not None:
+            yield item
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
 
 
 async def get_all():
     fname = await download_gcs_bucket(
         prefix="osv-vulnerabilities", name="all.zip", dst="osv/all"
     )
-    ufile = await unzip_file(fname)
-    return ufile
+    return fname
 
 
 async def get_recent():
@@ -125,12 +165,19 @@ async def clean_osv_files(path):
         logger.error(f"Error cleaning up {path}: {e}")
 
 
-async def parse_osv_file(path):
+async def parse_osv_file(
+    path, known_modified: dict | None = None, content: bytes | None = None
+):
     """
     Parses an OSV (Open Source Vulnerability) JSON file and converts it to VMA OSV database format.
 
     Args:
         path: Path to the OSV JSON file
+        known_modified: Optional mapping of osv_id to the modified timestamp already stored
+            in the database. Entries whose modified timestamp is unchanged are skipped and
+            empty arrays are returned.
+        content: Optional raw file content, already read by the caller (e.g. from a zip
+            member). When given, `path` is only used for logging.
 
     Returns:
         List containing [data_vuln, data_aliases, data_refs, data_severity, data_affected, data_credits] where:
@@ -147,17 +194,17 @@ async def parse_osv_file(path):
         - data_credits: List of tuples for osv_credits table
           (osv_id, name, contact, credit_type)
     """
-    data_vuln = []
-    data_aliases = []
-    data_refs = []
-    data_severity = []
-    data_affected = []
-    data_credits = []
 
-    try:
-        async with aiofiles.open(path, "r") as f:
-            content = await f.read()
-            osv_data = json.loads(content)
+    # Decoding and row building are CPU bound, run them in the thread pool
+    def _parse(content: bytes) -> list:
+        data_vuln = []
+        data_aliases = []
+        data_refs = []
+        data_severity = []
+        data_affected = []
+        data_credits = []
+
+        osv_data = orjson.loads(content)
 
         # Extract OSV ID (required field)
         osv_id = osv_data.get("id", "")
@@ -174,20 +221,23 @@ async def parse_osv_file(path):
             logger.error(f"OSV file {path} missing required 'modified' field")
             return [[], [], [], [], [], []]
         else:
-            modified = modified.replace("Z", "+00:00")
-            modified = datetime.fromisoformat(modified).astimezone()
+            modified = _parse_timestamp(modified)
+
+        # insert_osv_data commits modified together with the child rows, so a
+        # matching timestamp means the stored entry is complete
+        if known_modified and known_modified.get(osv_id) == modified:
+            logger.debug(f"OSV {osv_id} unchanged since last sync, skipping")
+            return [[], [], [], [], [], []]
 
         # Published timestamp (optional)
         published = osv_data.get("published", None)
         if published:
-            published = published.replace("Z", "+00:00")
-            published = datetime.fromisoformat(published).astimezone()
+            published = _parse_timestamp(published)
 
         # Withdrawn timestamp (optional)
         withdrawn = osv_data.get("withdrawn", None)
         if withdrawn:
-            withdrawn = withdrawn.replace("Z", "+00:00")
-            withdrawn = datetime.fromisoformat(withdrawn).astimezone()
+            withdrawn = _parse_timestamp(withdrawn)
 
         # Summary (optional)
         summary = osv_data.get("summary", None)
@@ -198,7 +248,7 @@ async def parse_osv_file(path):
         # Database-specific data (optional JSONB)
         database_specific = None
         if "database_specific" in osv_data:
-            database_specific = json.dumps(osv_data["database_specific"])
+            database_specific = osv_data["database_specific"]
 
         # Add main vulnerability record
         data_vuln.append(
@@ -248,22 +298,22 @@ async def parse_osv_file(path):
                 # Ranges (JSONB - complex version ranges)
                 ranges = None
                 if "ranges" in affected:
-                    ranges = json.dumps(affected["ranges"])
+                    ranges = affected["ranges"]
 
                 # Versions (JSONB - explicit list of affected versions)
                 versions = None
                 if "versions" in affected:
-                    versions = json.dumps(affected["versions"])
+                    versions = affected["versions"]
 
                 # Ecosystem-specific data
                 ecosystem_specific = None
                 if "ecosystem_specific" in affected:
-                    ecosystem_specific = json.dumps(affected["ecosystem_specific"])
+                    ecosystem_specific = affected["ecosystem_specific"]
 
                 # Database-specific data (per affected package)
                 affected_db_specific = None
                 if "database_specific" in affected:
-                    affected_db_specific = json.dumps(affected["database_specific"])
+                    affected_db_specific = affected["database_specific"]
 
                 if package_ecosystem and package_name:
                     data_affected.append(
@@ -285,12 +335,20 @@ async def parse_osv_file(path):
                 name = credit.get("name", "")
                 contact = None
                 if "contact" in credit:
-                    contact = json.dumps(credit["contact"])
+                    # A tuple keeps the row hashable for the de-duplication below,
+                    # the jsonb codec stores it as an array
+                    contact = tuple(credit["contact"])
                 credit_type = credit.get("type", None)
 
                 if name:  # Only add if name is present
                     data_credits.append((osv_id, name, contact, credit_type))
 
+        # Drop repeated rows (same alias/reference/score/credit listed twice) keeping order
+        data_aliases = list(dict.fromkeys(data_aliases))
+        data_refs = list(dict.fromkeys(data_refs))
+        data_severity = list(dict.fromkeys(data_severity))
+        data_credits = list(dict.fromkeys(data_credits))
+
         logger.debug(
             f"Parsed OSV file: {path} - ID: {osv_id}, "
             f"{len(data_aliases)} aliases, {len(data_refs)} refs, "
@@ -298,33 +356,66 @@ async def parse_osv_file(path):
             f"{len(data_credits)} credits"
         )
 
+        return [
+            data_vuln,
+            data_aliases,
+            data_refs,
+            data_severity,
+            data_affected,
+            data_credits,
+        ]
+
+    try:
+        if content is None:
+            content = await asyncio.to_thread(Path(path).read_bytes)
+        return await asyncio.to_thread(_parse, content)
     except FileNotFoundError:
         logger.error(f"OSV file not found: {path}")
         return [[], [], [], [], [], []]
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in OSV file {path}: {e}")
         return [[], [], [], [], [], []]
     except Exception as e:
         logger.error(f"Error parsing OSV file {path}: {e}")
         return [[], [], [], [], [], []]
 
-    return [
-        data_vuln,
-        data_aliases,
-        data_refs,
-        data_severity,
-        data_affected,
-        data_credits,
-    ]
-
 
 async def process_all():
+    """
+    Download the full OSV dump and load it into the database.
+
+    Decompression, parsing and insertion run as a pipeline: zip members are read
+    straight from all.zip with a bounded readahead and handed to a pool of OSV_WORKERS
+    parser tasks, whose entries go through a bounded queue that a single inserter
+    drains, so database writes overlap with parsing.
+    """
     src = await get_all()
-    files = await asyncio.to_thread(os.listdir, src)
-    for file in files:
-        file_path = os.path.join(src, file)
-        if file.endswith(".json"):
-            parsed_data = await parse_osv_file(file_path)
+    # Entries already stored with the same modified timestamp do not need to be rebuilt
+    known = await c.get_osv_modified()
+    known_modified = known["result"] if known.get("status") else None
+    zf = await asyncio.to_thread(zipfile.ZipFile, src)
+    names = [name for name in zf.namelist() if name.endswith(".json")]
+    members = asyncio.Queue(maxsize=_osv_workers * 2)
+    parsed = asyncio.Queue(maxsize=_osv_workers * 2)
+
+    async def reader():
+        async with aclosing(decompress_iter(zf, names)) as entries:
+            async for entry in entries:
+                await members.put(entry)
+        for _ in range(_osv_workers):
+            await members.put(None)
+
+    async def parser():
+        while (entry := await members.get()) is not None:
+            name, content = entry
+            await parsed.put(await parse_osv_file(name, known_modified, content))
+
+    async def run_parsers():
+        await asyncio.gather(*(parser() for _ in range(_osv_workers)))
+        await parsed.put(None)
+
+    async def inserter():
+        while (parsed_data := await parsed.get()) is not None:
             # Unpack the 6 data arrays
             (
                 data_vuln,
@@ -334,6 +425,8 @@ async def process_all():
                 data_affected,
                 data_credits,
             ) = parsed_data
+            if not data_vuln:
+                continue
             # Insert into database
             await c.insert_osv_data(
                 data_vuln=data_vuln,
@@ -343,9 +436,52 @@ async def process_all():
                 data_affected=data_affected,
                 data_credits=data_credits,
             )
+
+    # If one stage fails the others are cancelled, otherwise they would block forever
+    # on the bounded queues (asyncio.TaskGroup does this but needs Python 3.11)
+    tasks = [
+        asyncio.create_task(reader()),
+        asyncio.create_task(run_parsers()),
+        asyncio.create_task(inserter()),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        zf.close()
+    for task in tasks:
+        if not task.cancelled() and task.exception():
+            raise task.exception()
     await clean_osv_files("osv/")
 
 
+def parse_modified_csv(lines) -> list:
+    """
+    Parses the rows of a modified_id.csv file.
+
+    Args:
+        lines: Iterable of CSV lines (e.g. an open file or a list of strings),
+            the first one being the "id,modified" header
+
+    Returns:
+        List of (osv_id, modified) tuples for every well-formed row. Malformed rows
+        are logged and skipped.
+    """
+    entries = []
+    lines = iter(lines)
+    # Skip the header line, rows are validated by shape before parsing
+    next(lines, None)
+    for line in lines:
+        row = _CSV_ROW_RE.match(line)
+        if not row:
+            logger.warning(f"Skipping invalid CSV row: {line.rstrip()}")
+            continue
+        entries.append(row.groups())
+    return entries
+
+
 async def process_recent():
     """
     Process recently modified OSV vulnerabilities from the modified_id.csv file.
@@ -378,17 +514,9 @@ async def process_recent():
     try:
         async with aiofiles.open(csv_path, "r") as csvfile:
             content = await csvfile.read()
-            # Parse CSV from string
-            csv_reader = csv.DictReader(StringIO(content))
 
-            for row in csv_reader:
+            for osv_id, csv_modified in parse_modified_csv(content.splitlines()):
                 total_entries += 1
-                osv_id = row.get("id", "").strip()
-                csv_modified = row.get("modified", "").strip()
-
-                if not osv_id or not csv_modified:
-                    logger.warning(f"Skipping invalid CSV row: {row}")
-                    continue
 
                 # Compare the last modified date with our database
                 db_record = await c.get_osv_by_id(osv_id)
@@ -399,14 +527,9 @@ async def process_recent():
                     db_modified = db_record["result"].get("modified")
                     if db_modified:
                         # Convert both to datetime for comparison
-                        csv_dt = datetime.fromisoformat(
-                            csv_modified.replace("Z", "+00:00")
-                        )
-                        # Normalize Z suffix to +00:00 for Python 3.10 compatibility
+                        csv_dt = _parse_timestamp(csv_modified)
                         if isinstance(db_modified, str):
-                            db_dt = datetime.fromisoformat(
-                                db_modified.replace("Z", "+00:00")
-                            )
+                            db_dt = _parse_timestamp(db_modified)
                         else:
                             db_dt = db_modified
 
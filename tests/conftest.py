@@ -5,8 +5,10 @@ This file provides reusable fixtures and test utilities that can be used
 across all test files.
 """
 
+import orjson
 import pytest
-from unittest.mock import MagicMock, AsyncMock
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
 from httpx import AsyncClient, ASGITransport
 from datetime import datetime, timezone
 
@@ -39,8 +41,10 @@ async def client():
 # ============================================================================
 # Authentication Token Fixtures
 # ============================================================================
+# Session-scoped: JwtData is only read by the routers, so one instance per
+# identity is shared by every test.
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def read_only_user_token():
     """
     JWT data for a user with read-only access to team1.
@@ -54,7 +58,7 @@ def read_only_user_token():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def write_user_token():
     """
     JWT data for a user with write access to team1.
@@ -68,7 +72,22 @@ def write_user_token():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def regular_user_token():
+    """
+    JWT data for a regular user with write access to team1.
+
+    Same access as write_user_token, under the user@test.com identity the user
+    management tests use for self-service requests.
+    """
+    return mod_v1.JwtData(
+        username="user@test.com",
+        scope={"team1": "write"},
+        root=False
+    )
+
+
+@pytest.fixture(scope="session")
 def admin_user_token():
     """
     JWT data for a user with admin access to team1.
@@ -82,7 +101,7 @@ def admin_user_token():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def multi_team_user_token():
     """
     JWT data for a user with access to multiple teams.
@@ -103,7 +122,7 @@ def multi_team_user_token():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def root_user_token():
     """
     JWT data for a root user.
@@ -142,6 +161,18 @@ def override_auth_dependency():
     return _override
 
 
+@pytest.fixture(autouse=True)
+def clear_dependency_overrides():
+    """
+    Remove every dependency override after each test.
+
+    Overrides installed by a test or a fixture never leak into the next test,
+    whichever module it belongs to.
+    """
+    yield
+    api_server.dependency_overrides.clear()
+
+
 # ============================================================================
 # Sample Data Fixtures
 # ============================================================================
@@ -474,11 +505,8 @@ def mock_helper_errors():
     - invalid_token_format: Invalid API token format
 
     Usage:
-        def test_something(mock_helper_errors):
-            with patch("vma.api.routers.v1.helper") as mock_helper:
-                mock_helper.errors = mock_helper_errors
-                mock_helper.validate_input.return_value = "validated"
-                # ... rest of test
+        Tests that use the reset_router_mocks fixture get these errors on
+        patched_router["helper"].errors before every test.
 
     This fixture ensures consistent mocking across all tests and prevents
     KeyError when code accesses error codes like helper.errors["401"].
@@ -512,8 +540,6 @@ def mock_router_dependencies(mock_helper_errors):
 
             # Test code here
     """
-    from unittest.mock import patch
-
     with patch("vma.api.routers.v1.c") as mock_c, \
          patch("vma.api.routers.v1.helper") as mock_helper:
 
@@ -553,3 +579,95 @@ def mock_router_dependencies(mock_helper_errors):
         mock_c.compare_image_versions = AsyncMock(return_value={"status": True, "result": []})
 
         yield {"connector": mock_c, "helper": mock_helper}
+
+
+# ============================================================================
+# Router Stub Fixtures
+# ============================================================================
+# Lighter than mock_router_dependencies: the router's connector, helper and
+# password hasher are patched once per module and reset before every test.
+# Modules opt in with pytestmark = pytest.mark.usefixtures("reset_router_mocks")
+# and import the helpers below with `from conftest import ...`.
+
+# Request headers for tests that override token validation; never mutated
+AUTH_HDRS = {"Authorization": "Bearer fake_token"}
+JSON_HDRS = {**AUTH_HDRS, "Content-Type": "application/json"}
+
+
+def jbody(response):
+    """Decode a JSON response body"""
+    return orjson.loads(response.content)
+
+
+def keep_input(value):
+    return value
+
+
+def reject_input(value):
+    return None
+
+
+def none_if_empty(value):
+    return value if value else None
+
+
+class StubHelper:
+    """
+    Stands in for vma.helper in the router: plain functions and canned results.
+
+    validate_input passes input through unless a test swaps it (e.g. for
+    reject_input); validate_scopes and normalize_comparison return whatever
+    the test sets on `scopes` and `comparison`.
+    """
+
+    def __init__(self):
+        self.reset({})
+
+    def reset(self, errors):
+        self.errors = errors
+        self.scopes = None
+        self.comparison = None
+        self.validate_input = keep_input
+
+    def escape_like(self, value):
+        return value
+
+    def validate_scopes(self, data):
+        return self.scopes
+
+    def normalize_comparison(self, data):
+        return self.comparison
+
+
+class StubHasher:
+    """Stands in for the argon2 password hasher: deterministic and records what it hashed"""
+
+    def __init__(self):
+        self.hashed = []
+
+    def hash(self, password):
+        self.hashed.append(password)
+        return f"hashed_{password}"
+
+
+@pytest.fixture(scope="module")
+def patched_router():
+    """
+    Patch the router's connector, helper and password hasher once for the whole module.
+
+    The connector is a bare namespace rather than a MagicMock: each test installs the
+    connector functions it needs, and any other connector call fails loudly.
+    """
+    with patch("vma.api.routers.v1.c", SimpleNamespace()) as mock_c, \
+         patch("vma.api.routers.v1.helper", StubHelper()) as mock_helper, \
+         patch("vma.api.routers.v1.a.hasher", StubHasher()) as mock_hasher:
+        yield {"connector": mock_c, "helper": mock_helper, "hasher": mock_hasher}
+
+
+@pytest.fixture
+def reset_router_mocks(patched_router, mock_helper_errors):
+    """Give a test clean connector/helper/hasher stubs"""
+    vars(patched_router["connector"]).clear()
+    patched_router["helper"].reset(mock_helper_errors)
+    patched_router["hasher"].hashed.clear()
+    return patched_router
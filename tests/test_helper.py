@@ -0,0 +1,134 @@
+"""
+Tests for the helper functions the API routers use.
+
+Tests cover:
+- Scope string validation (team:scope pairs)
+- Vulnerability row formatting
+- Image comparison normalization
+- SQL LIKE escaping
+"""
+
+import pytest
+from datetime import datetime, timezone
+
+from vma.helper import validate_scopes
+
+
+# Fixed timestamp for row fixtures, so results do not depend on the wall clock
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Vulnerability rows as the connector returns them; tuples are immutable
+_VULN_ROWS = (
+    ("CVE-2023-1234", "1.2.3", "deb", "libssl", "1.0.0", "/usr/lib",
+     _FIXED_TS, _FIXED_TS, 7.5, "HIGH", "3.1"),
+    ("CVE-2023-5678", "", "python", "requests", "2.28.0", "/usr/local",
+     _FIXED_TS, _FIXED_TS, 5.3, "MEDIUM", "3.1"),
+)
+
+# Image comparison rows; normalize_comparison only reads them
+_COMPARISON_ROWS = (
+    (
+        "CVE-2023-1",
+        "HIGH",
+        "shared",
+        "deb",
+        "lib1",
+        "/path1",
+        7.5,
+        0.2,
+        ["http://example.com"],
+        ["CWE-79"],
+        {"versions": ["1.2.3"]},
+    ),
+    (
+        "CVE-2023-2",
+        "MEDIUM",
+        "only_version_a",
+        "deb",
+        "lib2",
+        "/path2",
+        5.0,
+        0.1,
+        [],
+        [],
+        {"versions": []},
+    ),
+    (
+        "CVE-2023-3",
+        "CRITICAL",
+        "only_version_b",
+        "python",
+        "lib3",
+        "/path3",
+        9.0,
+        0.9,
+        [],
+        [],
+        {"versions": ["2.0.0"]},
+    ),
+)
+
+
+class TestScopeValidation:
+    """Tests for scope string validation"""
+
+    @pytest.mark.parametrize("scopes, expected", [
+        ("team1:read", {"team1": "read"}),
+        ("team1:admin,team2:write,team3:read", {"team1": "admin", "team2": "write", "team3": "read"}),
+        ("", None),
+        (None, None),
+    ], ids=["single_team", "multiple_teams", "empty_string", "none"])
+    def test_validate_scopes(self, scopes, expected):
+        """Test parsing team:scope strings; empty or missing scopes return None"""
+        assert validate_scopes(scopes) == expected
+
+
+class TestHelperFunctions:
+    """Tests for vulnerability row formatting and query helpers"""
+
+    def test_format_vulnerability_rows(self):
+        """Test formatting vulnerability rows for display"""
+        from vma.helper import format_vulnerability_rows
+
+        formatted = format_vulnerability_rows(_VULN_ROWS)
+
+        assert len(formatted) == 2
+        assert formatted[0]["cve"] == "CVE-2023-1234"
+        assert formatted[0]["component"] == "libssl"
+        assert formatted[0]["cvss"]["score"] == 7.5
+        assert formatted[0]["cvss"]["severity"] == "HIGH"
+        assert formatted[0]["first_seen"] == "2024-01-01"
+
+    def test_normalize_comparison(self):
+        """Test normalizing comparison results"""
+        from vma.helper import normalize_comparison
+
+        result = normalize_comparison(_COMPARISON_ROWS)
+
+        assert result["stats"]["shared"] == 1
+        assert result["stats"]["only_version_a"] == 1
+        assert result["stats"]["only_version_b"] == 1
+        assert len(result["comparison"]) == 3
+
+    def test_normalize_comparison_empty(self):
+        """Test normalizing empty comparison"""
+        from vma.helper import normalize_comparison
+
+        result = normalize_comparison([])
+
+        assert result["stats"]["shared"] == 0
+        assert result["stats"]["only_version_a"] == 0
+        assert result["stats"]["only_version_b"] == 0
+        assert result["comparison"] == []
+
+    @pytest.mark.parametrize("value, expected", [
+        ("test%", "test\\%"),
+        ("test_value", "test\\_value"),
+        ("normal", "normal"),
+        ("mix%ed_chars", "mix\\%ed\\_chars"),
+    ])
+    def test_escape_like_special_chars(self, value, expected):
+        """Test escaping special characters for SQL LIKE"""
+        from vma.helper import escape_like
+
+        assert escape_like(value) == expected
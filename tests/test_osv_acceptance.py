@@ -20,10 +20,16 @@ Following JARVIS principles:
 """
 
 import pytest
+import asyncio
+import io
 import json
 import os
 import tempfile
 import shutil
+import threading
+import time
+import zipfile
+import asyncpg
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock, AsyncMock, mock_open, call
 
@@ -184,7 +190,7 @@ class TestOSVParser:
         Expected:
         - Returns 6-element list [vuln, aliases, refs, severity, affected, credits]
         - All data correctly extracted and formatted
-        - JSONB fields properly serialized as JSON strings
+        - JSONB fields kept as Python values for the jsonb codec
         """
         # Write sample JSON to temp file
         json_path = os.path.join(temp_dir, "test_osv.json")
@@ -210,8 +216,7 @@ class TestOSVParser:
         assert vuln_entry[4] is None  # withdrawn
         assert "SQL injection" in vuln_entry[5]  # summary
         assert "authentication module" in vuln_entry[6]  # details
-        assert isinstance(vuln_entry[7], str)  # database_specific
-        assert json.loads(vuln_entry[7]) == sample_osv_json["database_specific"]
+        assert vuln_entry[7] == sample_osv_json["database_specific"]  # database_specific
 
         # Test aliases
         assert len(data_aliases) == 2
@@ -239,10 +244,8 @@ class TestOSVParser:
         assert npm_pkg[1] == "npm"  # ecosystem
         assert npm_pkg[2] == "example-package"  # name
         assert npm_pkg[3] == "pkg:npm/example-package"  # purl
-        assert isinstance(npm_pkg[4], str)  # ranges
-        assert isinstance(npm_pkg[5], str)  # versions
-        assert json.loads(npm_pkg[4]) == sample_osv_json["affected"][0]["ranges"]
-        assert json.loads(npm_pkg[5]) == sample_osv_json["affected"][0]["versions"]
+        assert npm_pkg[4] == sample_osv_json["affected"][0]["ranges"]  # ranges
+        assert npm_pkg[5] == sample_osv_json["affected"][0]["versions"]  # versions
 
         # Test credits
         assert len(data_credits) == 2
@@ -279,6 +282,54 @@ class TestOSVParser:
         assert len(data_affected) == 0
         assert len(data_credits) == 0
 
+    @pytest.mark.asyncio
+    async def test_parse_deduplicates_child_rows(self, sample_osv_json, temp_dir):
+        """
+        Test parser dropping repeated aliases, references and credits.
+
+        Expected:
+        - Each distinct row appears once
+        - Original order is preserved
+        """
+        sample_osv_json["aliases"].append("CVE-2025-12345")
+        sample_osv_json["references"].append(dict(sample_osv_json["references"][0]))
+        sample_osv_json["credits"].append(dict(sample_osv_json["credits"][1]))
+
+        json_path = os.path.join(temp_dir, "dup_osv.json")
+        with open(json_path, "w") as f:
+            json.dump(sample_osv_json, f)
+
+        _, data_aliases, data_refs, _, _, data_credits = await osv.parse_osv_file(json_path)
+
+        assert data_aliases == [
+            ("GHSA-1234-5678-9abc", "CVE-2025-12345"),
+            ("GHSA-1234-5678-9abc", "CVE-2025-67890"),
+        ]
+        assert len(data_refs) == 3
+        assert data_refs[0][1] == "ADVISORY"
+        assert len(data_credits) == 2
+
+    @pytest.mark.asyncio
+    async def test_parse_skips_unchanged_osv(self, sample_osv_json, temp_dir):
+        """
+        Test parser skipping entries already stored with the same modified timestamp.
+
+        Expected:
+        - Returns empty arrays when known_modified matches the file
+        - Parses normally when the stored timestamp is older
+        """
+        json_path = os.path.join(temp_dir, "test_osv.json")
+        with open(json_path, "w") as f:
+            json.dump(sample_osv_json, f)
+
+        stored = datetime.fromisoformat("2025-12-29T10:00:00+00:00")
+        result = await osv.parse_osv_file(json_path, {"GHSA-1234-5678-9abc": stored})
+        assert all(len(arr) == 0 for arr in result), "Unchanged entry should be skipped"
+
+        older = datetime.fromisoformat("2025-12-28T10:00:00+00:00")
+        result = await osv.parse_osv_file(json_path, {"GHSA-1234-5678-9abc": older})
+        assert len(result[0]) == 1, "Modified entry should be parsed"
+
     @pytest.mark.asyncio
     async def test_parse_missing_required_fields(self, temp_dir):
         """
@@ -334,6 +385,31 @@ class TestOSVParser:
         result = await osv.parse_osv_file("/nonexistent/path/to/file.json")
         assert all(len(arr) == 0 for arr in result), "Should handle missing file gracefully"
 
+    @pytest.mark.asyncio
+    async def test_parse_runs_off_event_loop(self, sample_osv_json):
+        """
+        Test that decoding and row building run in the thread pool.
+
+        Expected:
+        - Timestamps are parsed on a thread other than the event loop's
+        - The entry is still parsed
+        """
+        threads = set()
+        parse_timestamp = osv._parse_timestamp
+
+        def record_thread(value):
+            threads.add(threading.get_ident())
+            return parse_timestamp(value)
+
+        with patch('vma.osv._parse_timestamp', side_effect=record_thread):
+            data_vuln, *_ = await osv.parse_osv_file(
+                "test_osv.json", content=json.dumps(sample_osv_json).encode()
+            )
+
+        assert data_vuln[0][0] == "GHSA-1234-5678-9abc"
+        assert threads
+        assert threading.get_ident() not in threads
+
 
 # ============================================================================
 # Database Operations Tests
@@ -395,6 +471,185 @@ class TestOSVDatabaseOperations:
         assert mock_conn.commit.call_count >= 1
         mock_put_conn.assert_called_once_with(mock_conn)
 
+    @pytest.mark.asyncio
+    async def test_insert_osv_data_copies_child_records(self, sample_osv_json, temp_dir):
+        """
+        Test that child tables are bulk loaded with COPY.
+
+        Expected:
+        - Main record and aliases go through executemany (upsert)
+        - References, severity, affected and credits use copy_records_to_table
+        - Returns {"status": True, "result": {"osv_id": "..."}}
+        """
+        json_path = os.path.join(temp_dir, "test_osv.json")
+        with open(json_path, "w") as f:
+            json.dump(sample_osv_json, f)
+
+        data_vuln, data_aliases, data_refs, data_severity, data_affected, data_credits = \
+            await osv.parse_osv_file(json_path)
+
+        mock_conn = MagicMock()
+        mock_conn.executemany = AsyncMock()
+        mock_conn.execute = AsyncMock()
+        mock_conn.copy_records_to_table = AsyncMock()
+        mock_pool = MagicMock()
+        mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
+
+        with patch('vma.connector.get_pool', new_callable=AsyncMock, return_value=mock_pool):
+            result = await c.insert_osv_data(
+                data_vuln=data_vuln,
+                data_aliases=data_aliases,
+                data_refs=data_refs,
+                data_severity=data_severity,
+                data_affected=data_affected,
+                data_credits=data_credits
+            )
+
+        assert result == {"status": True, "result": {"osv_id": "GHSA-1234-5678-9abc"}}
+        assert mock_conn.transaction.call_count == 1
+        assert mock_conn.executemany.call_count == 2
+        copied = {
+            args[0]: kwargs["records"]
+            for args, kwargs in mock_conn.copy_records_to_table.call_args_list
+        }
+        assert copied == {
+            "osv_references": data_refs,
+            "osv_severity": data_severity,
+            "osv_affected": data_affected,
+            "osv_credits": data_credits,
+        }
+
+    @pytest.mark.asyncio
+    async def test_insert_osv_data_rolls_back_on_copy_failure(self, sample_osv_json, temp_dir):
+        """
+        Test that a failing COPY rolls back the whole entry.
+
+        Expected:
+        - Upsert, deletes and COPYs run inside one transaction
+        - The transaction exits with the COPY error, so nothing is committed
+        - Returns {"status": False, ...}
+        """
+        json_path = os.path.join(temp_dir, "test_osv.json")
+        with open(json_path, "w") as f:
+            json.dump(sample_osv_json, f)
+
+        parsed_data = await osv.parse_osv_file(json_path)
+
+        error = asyncpg.exceptions.InternalClientError("no binary format encoder for type jsonb")
+        mock_conn = MagicMock()
+        mock_conn.executemany = AsyncMock()
+        mock_conn.execute = AsyncMock()
+        mock_conn.copy_records_to_table = AsyncMock(side_effect=[None, None, error])
+        mock_pool = MagicMock()
+        mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
+
+        with patch('vma.connector.get_pool', new_callable=AsyncMock, return_value=mock_pool):
+            result = await c.insert_osv_data(*parsed_data)
+
+        assert result == {"status": False, "result": {"osv_id": "GHSA-1234-5678-9abc"}}
+        assert mock_conn.transaction.call_count == 1
+        exc_type, exc, _ = mock_conn.transaction.return_value.__aexit__.call_args[0]
+        assert exc is error
+
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_insert_osv_data_copies_into_database(self, sample_osv_json, temp_dir, test_database_config):
+        """
+        Test insert_osv_data against a real database through the pool codec.
+
+        Expected:
+        - jsonb child columns are COPYed with the binary codec
+        - Re-inserting the same entry replaces its child rows
+
+        Skipped when the integration test database is not reachable.
+        """
+        try:
+            pool = await asyncpg.create_pool(
+                **test_database_config, min_size=1, max_size=1, init=c._init_connection
+            )
+        except (OSError, asyncpg.PostgresError) as e:
+            pytest.skip(f"Test database not available: {e}")
+
+        json_path = os.path.join(temp_dir, "test_osv.json")
+        with open(json_path, "w") as f:
+            json.dump(sample_osv_json, f)
+
+        parsed_data = await osv.parse_osv_file(json_path)
+        osv_id = sample_osv_json["id"]
+
+        try:
+            with patch('vma.connector.get_pool', new_callable=AsyncMock, return_value=pool):
+                assert (await c.insert_osv_data(*parsed_data))["status"] is True
+                assert (await c.insert_osv_data(*parsed_data))["status"] is True
+
+            async with pool.acquire() as conn:
+                affected = await conn.fetch(
+                    "SELECT ranges, versions FROM osv_affected WHERE osv_id = $1 ORDER BY package_name",
+                    osv_id,
+                )
+                credits = await conn.fetch(
+                    "SELECT contact FROM osv_credits WHERE osv_id = $1 ORDER BY name", osv_id
+                )
+        finally:
+            async with pool.acquire() as conn:
+                await conn.execute(c.queries["delete_osv_by_id"], osv_id)
+            await pool.close()
+
+        assert len(affected) == 2
+        assert affected[0]["versions"] == ["1.0.0", "1.5.0", "1.9.9"]
+        assert [row["contact"] for row in credits] == [None, ["security@example.com"]]
+
+    @pytest.mark.asyncio
+    async def test_get_osv_modified(self):
+        """
+        Test reading the stored modified timestamps used to skip unchanged entries.
+
+        Expected:
+        - Returns {"status": True, "result": {osv_id: modified}}
+        - Returns {"status": False, "result": {}} on database errors, so
+          process_all parses every entry instead of skipping any
+        """
+        modified = datetime(2025, 12, 29, 10, 0, tzinfo=timezone.utc)
+        mock_conn = MagicMock()
+        mock_conn.fetch = AsyncMock(return_value=[("GHSA-1234-5678-9abc", modified)])
+        mock_pool = MagicMock()
+        mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
+
+        with patch('vma.connector.get_pool', new_callable=AsyncMock, return_value=mock_pool):
+            result = await c.get_osv_modified()
+
+            mock_conn.fetch.side_effect = asyncpg.PostgresError("connection lost")
+            failed = await c.get_osv_modified()
+
+        assert result == {"status": True, "result": {"GHSA-1234-5678-9abc": modified}}
+        assert failed == {"status": False, "result": {}}
+
+    @pytest.mark.asyncio
+    async def test_pool_registers_binary_jsonb_codec(self):
+        """
+        Test the jsonb codec installed on every pooled connection.
+
+        Expected:
+        - Registered in binary format, which COPY requires for every column
+        - Encoded values carry the jsonb version byte and decode back
+        - Every value is serialized, so a str is stored as a JSON string
+        """
+        mock_conn = MagicMock()
+        mock_conn.set_type_codec = AsyncMock()
+
+        await c._init_connection(mock_conn)
+
+        args, kwargs = mock_conn.set_type_codec.call_args
+        assert args == ("jsonb",)
+        assert kwargs["format"] == "binary"
+
+        encode, decode = kwargs["encoder"], kwargs["decoder"]
+        value = {"ranges": [{"type": "SEMVER"}], "versions": ["1.0.0"]}
+        assert encode(value).startswith(b"\x01")
+        assert decode(encode(value)) == value
+        assert encode("1.0.0") == b'\x01"1.0.0"'
+        assert decode(encode("1.0.0")) == "1.0.0"
+
     @patch('vma.connector.get_osv_by_id', new_callable=AsyncMock)
     @pytest.mark.asyncio
     async def test_get_osv_by_id_exists(self, mock_get_osv):
@@ -521,35 +776,41 @@ class TestProcessAllWorkflow:
     """Test process_all() full sync workflow"""
 
     @patch('vma.osv.get_all')
+    @patch('vma.osv.c.get_osv_modified')
     @patch('vma.osv.parse_osv_file')
     @patch('vma.osv.c.insert_osv_data')
     @patch('vma.osv.clean_osv_files')
-    @patch('vma.osv.os.listdir')
     @pytest.mark.asyncio
     async def test_process_all_success(
         self,
-        mock_listdir,
         mock_clean,
         mock_insert,
         mock_parse,
+        mock_get_modified,
         mock_get_all,
-        sample_osv_json
+        sample_osv_json,
+        temp_dir
     ):
         """
         Test complete process_all workflow.
 
         Expected:
         - Downloads all.zip
-        - Extracts to osv/all/extracted/
+        - Reads JSON members straight from the zip
         - Parses all JSON files
         - Inserts each into database
         - Cleans up files
         """
-        # Mock get_all to return extraction path
-        mock_get_all.return_value = "osv/all/extracted/"
+        # Build the downloaded zip
+        zip_path = os.path.join(temp_dir, "all.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("vuln1.json", json.dumps(sample_osv_json))
+            zf.writestr("vuln2.json", json.dumps(sample_osv_json))
+            zf.writestr("readme.txt", "not an OSV entry")
+        mock_get_all.return_value = zip_path
 
-        # Mock directory listing
-        mock_listdir.return_value = ["vuln1.json", "vuln2.json", "readme.txt"]
+        # Mock stored modified timestamps (nothing stored yet)
+        mock_get_modified.return_value = {"status": True, "result": {}}
 
         # Mock parser output
         mock_parse.return_value = [
@@ -570,10 +831,171 @@ class TestProcessAllWorkflow:
         # Verify calls
         mock_get_all.assert_called_once()
         assert mock_parse.call_count == 2  # Only JSON files
+        assert [args[0] for args, _ in mock_parse.call_args_list] == ["vuln1.json", "vuln2.json"]
+        assert mock_parse.call_args_list[0].args[2] == json.dumps(sample_osv_json).encode()
         assert mock_insert.call_count == 2
         mock_clean.assert_called_once_with("osv/")
 
 
+    @patch('vma.osv.get_all')
+    @patch('vma.osv.c.get_osv_modified')
+    @patch('vma.osv.c.insert_osv_data')
+    @patch('vma.osv.clean_osv_files')
+    @pytest.mark.asyncio
+    async def test_process_all_insert_failure_stops_parser(
+        self,
+        mock_clean,
+        mock_insert,
+        mock_get_modified,
+        mock_get_all,
+        sample_osv_json,
+        temp_dir
+    ):
+        """
+        Test that a failing insert does not leave the parser blocked on the queue.
+
+        Expected:
+        - The insert error propagates out of process_all instead of hanging
+        - No parser or readahead task is left running after it returns
+        - Files are not cleaned up
+        """
+        zip_path = os.path.join(temp_dir, "all.zip")
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for i in range(100):
+                zf.writestr(f"vuln{i}.json", json.dumps(sample_osv_json))
+        mock_get_all.return_value = zip_path
+        mock_get_modified.return_value = {"status": True, "result": {}}
+        mock_insert.side_effect = RuntimeError("database gone")
+
+        with pytest.raises(RuntimeError, match="database gone"):
+            await asyncio.wait_for(osv.process_all(), timeout=5)
+
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        assert mock_insert.call_count == 1
+        mock_clean.assert_not_called()
+
+    @patch('vma.osv._osv_workers', 3)
+    @patch('vma.osv.get_all')
+    @patch('vma.osv.c.get_osv_modified')
+    @patch('vma.osv.parse_osv_file')
+    @patch('vma.osv.c.insert_osv_data')
+    @patch('vma.osv.clean_osv_files')
+    @pytest.mark.asyncio
+    async def test_process_all_parses_with_worker_pool(
+        self,
+        mock_clean,
+        mock_insert,
+        mock_parse,
+        mock_get_modified,
+        mock_get_all,
+        sample_osv_json,
+        temp_dir
+    ):
+        """
+        Test that process_all runs OSV_WORKERS parsers at the same time.
+
+        Expected:
+        - At most OSV_WORKERS members are parsed concurrently, and that many are reached
+        - Every member is parsed once
+        """
+        zip_path = os.path.join(temp_dir, "all.zip")
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for i in range(10):
+                zf.writestr(f"vuln{i}.json", json.dumps(sample_osv_json))
+        mock_get_all.return_value = zip_path
+        mock_get_modified.return_value = {"status": True, "result": {}}
+
+        running = 0
+        peak = 0
+
+        async def slow_parse(name, known_modified, content):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [[], [], [], [], [], []]
+
+        mock_parse.side_effect = slow_parse
+
+        await asyncio.wait_for(osv.process_all(), timeout=5)
+
+        assert peak == 3
+        assert sorted(args[0] for args, _ in mock_parse.call_args_list) == sorted(
+            f"vuln{i}.json" for i in range(10)
+        )
+        mock_insert.assert_not_called()
+        mock_clean.assert_called_once_with("osv/")
+
+
+class TestDecompressIter:
+    """Test decompress_iter() readahead over zip members"""
+
+    class SlowZip:
+        """Zip stand-in whose reads take a while and track how many are in flight"""
+
+        def __init__(self, delay=0.0, broken=()):
+            self.delay = delay
+            self.broken = broken
+            self.in_flight = 0
+
+        def read(self, name):
+            self.in_flight += 1
+            try:
+                time.sleep(self.delay)
+                if name in self.broken:
+                    raise zipfile.BadZipFile(f"Bad CRC-32 for file {name}")
+                return name.encode()
+            finally:
+                self.in_flight -= 1
+
+    @pytest.mark.asyncio
+    async def test_yields_members_in_order(self):
+        """
+        Expected:
+        - Members come out in the order given, whatever the prefetch depth
+        """
+        names = [f"vuln{i}.json" for i in range(20)]
+
+        items = [item async for item in osv.decompress_iter(self.SlowZip(), names, prefetch=3)]
+
+        assert items == [(name, name.encode()) for name in names]
+
+    @pytest.mark.asyncio
+    async def test_skips_unreadable_members(self):
+        """
+        Expected:
+        - A member that fails to decompress is logged and skipped
+        - The following members are still yielded
+        """
+        names = ["vuln1.json", "vuln2.json", "vuln3.json"]
+        zf = self.SlowZip(broken={"vuln2.json"})
+
+        items = [name async for name, _ in osv.decompress_iter(zf, names)]
+
+        assert items == ["vuln1.json", "vuln3.json"]
+
+    @pytest.mark.asyncio
+    async def test_close_waits_for_read_in_flight(self):
+        """
+        Expected:
+        - Closing the generator early cancels the readahead
+        - It only returns once the read running in the worker thread is done,
+          so the caller can close the zip file right after
+        """
+        names = [f"vuln{i}.json" for i in range(5)]
+        zf = self.SlowZip(delay=0.05)
+        members = osv.decompress_iter(zf, names, prefetch=1)
+
+        assert await members.__anext__() == ("vuln0.json", b"vuln0.json")
+        await asyncio.sleep(0.01)
+        assert zf.in_flight == 1
+
+        await members.aclose()
+
+        assert zf.in_flight == 0
+
+
 class TestProcessRecentWorkflow:
     """Test process_recent() incremental sync workflow"""
 
@@ -741,6 +1163,26 @@ class TestTimestampComparison:
 
         assert csv_dt == db_dt, "Timestamps should be equal"
 
+    @pytest.mark.parametrize("value", [
+        "2025-12-29T10:00:00Z",
+        "2025-12-29T10:00:00.123Z",
+        "2025-12-29T12:00:00+02:00",
+        "2025-12-29T05:30:00.123456-04:30",
+    ], ids=["utc_z", "fractional_z", "positive_offset", "negative_offset"])
+    def test_parse_timestamp_is_timezone_aware(self, value):
+        """
+        Test: _parse_timestamp keeps the offset and matches the previous
+        replace("Z", "+00:00") + fromisoformat().astimezone() parsing
+        """
+        previous = datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone()
+
+        parsed = osv._parse_timestamp(value)
+
+        assert parsed.tzinfo is not None
+        assert parsed.utcoffset() == datetime.fromisoformat(value.replace("Z", "+00:00")).utcoffset()
+        assert parsed == previous
+        assert osv._parse_timestamp(value) is parsed  # cached
+
 
 # ============================================================================
 # File Cleanup Tests
@@ -942,8 +1384,7 @@ class TestErrorHandling:
 
         assert result["status"] is False
 
-    @pytest.mark.asyncio
-    async def test_csv_parsing_malformed_row(self, temp_dir):
+    def test_csv_parsing_malformed_row(self):
         """
         Test CSV parsing with malformed rows.
 
@@ -952,21 +1393,42 @@ class TestErrorHandling:
         - Continues processing valid rows
         - Logs warning
         """
-        csv_path = os.path.join(temp_dir, "malformed.csv")
-        with open(csv_path, 'w') as f:
-            f.write("id,modified\n")
-            f.write("VALID-ID,2025-12-29T10:00:00Z\n")
-            f.write("INVALID-ROW-MISSING-TIMESTAMP\n")
-            f.write("ANOTHER-VALID,2025-12-28T10:00:00Z\n")
+        stream = io.StringIO(
+            "id,modified\n"
+            "VALID-ID,2025-12-29T10:00:00Z\n"
+            "INVALID-ROW-MISSING-TIMESTAMP\n"
+            "ANOTHER-VALID,2025-12-28T10:00:00Z\n"
+        )
 
-        with patch('vma.osv.c.get_osv_by_id') as mock_get:
-            with patch('vma.osv.download_gcs_bucket'):
-                with patch('vma.osv.parse_osv_file'):
-                    with patch('vma.osv.c.insert_osv_data'):
-                        mock_get.return_value = {"status": False}
+        entries = osv.parse_modified_csv(stream)
+
+        # Should process 2 valid rows, skip 1 invalid
+        assert entries == [
+            ("VALID-ID", "2025-12-29T10:00:00Z"),
+            ("ANOTHER-VALID", "2025-12-28T10:00:00Z"),
+        ]
+
+    @pytest.mark.parametrize("row, expected", [
+        ("MILLIS,2025-12-29T10:00:00.123Z", [("MILLIS", "2025-12-29T10:00:00.123Z")]),
+        ("MICROS,2025-12-29T10:00:00.123456Z", [("MICROS", "2025-12-29T10:00:00.123456Z")]),
+        ("  PADDED , 2025-12-29T10:00:00Z ", [("PADDED", "2025-12-29T10:00:00Z")]),
+        ("ONE-DIGIT,2025-12-29T10:00:00.1Z", []),
+        ("FIVE-DIGITS,2025-12-29T10:00:00.12345Z", []),
+        ("NANOS,2025-12-29T10:00:00.123456789Z", []),
+    ], ids=["millis", "micros", "padded", "one_digit", "five_digits", "nanos"])
+    def test_csv_parsing_fractional_seconds(self, row, expected):
+        """
+        Test that only rows whose timestamp _parse_timestamp can read are kept.
+
+        Expected:
+        - 3 and 6 digit fractions and padded fields are accepted and parse
+        - Other fraction lengths are skipped instead of failing later
+        """
+        entries = osv.parse_modified_csv(["id,modified", row])
 
-                        # Should process 2 valid rows, skip 1 invalid
-                        # This would be verified by checking logs in actual implementation
+        assert entries == expected
+        for _, modified in entries:
+            assert osv._parse_timestamp(modified).tzinfo is not None
 
 
 if __name__ == "__main__":
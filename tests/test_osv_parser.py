@@ -3,102 +3,91 @@
 Test script for OSV parser with new schema
 """
 
-import sys
-import os
-import asyncio
+import json
+import logging
 import pytest
-
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+from datetime import datetime, timezone
 
 from vma.osv import parse_osv_file
 
+logger = logging.getLogger(__name__)
+
+OSV_ENTRY = {
+    "id": "GHSA-test-osv-0001",
+    "schema_version": "1.6.0",
+    "modified": "2025-06-01T12:00:00Z",
+    "published": "2025-05-30T08:00:00Z",
+    "summary": "Test vulnerability",
+    "details": "Test vulnerability used by the OSV parser test.",
+    "aliases": ["CVE-2025-0001"],
+    "references": [{"type": "ADVISORY", "url": "https://example.com/advisory"}],
+    "severity": [{"type": "CVSS_V3", "score": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"}],
+    "affected": [
+        {
+            "package": {"ecosystem": "PyPI", "name": "example", "purl": "pkg:pypi/example"},
+            "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}, {"fixed": "1.2.0"}]}],
+            "versions": ["1.0.0", "1.1.0"],
+        }
+    ],
+    "credits": [{"name": "Finder", "contact": ["finder@example.com"], "type": "FINDER"}],
+    "database_specific": {"severity": "HIGH"},
+}
+
+
 @pytest.mark.asyncio
-async def test_osv_parser():
+async def test_osv_parser(tmp_path):
     """Test the OSV parser with sample data"""
-    test_file = "osv/test_osv.json"
+    test_file = tmp_path / "test_osv.json"
+    test_file.write_text(json.dumps(OSV_ENTRY))
 
-    print(f"Testing OSV parser with file: {test_file}")
-    print("=" * 60)
+    logger.debug("Testing OSV parser with file: %s", test_file)
 
     # Parse the test file
-    result = await parse_osv_file(test_file)
-
-    if not result or len(result) != 6:
-        print("ERROR: Parser did not return expected format [vuln, aliases, refs, severity, affected, credits]")
-        return False
+    result = await parse_osv_file(str(test_file))
 
+    # [vuln, aliases, refs, severity, affected, credits]
+    assert len(result) == 6
     data_vuln, data_aliases, data_refs, data_severity, data_affected, data_credits = result
 
-    print(f"\n✓ Parser returned data successfully")
-    print(f"  - Vulnerability entries: {len(data_vuln)}")
-    print(f"  - Aliases: {len(data_aliases)}")
-    print(f"  - References: {len(data_refs)}")
-    print(f"  - Severity entries: {len(data_severity)}")
-    print(f"  - Affected packages: {len(data_affected)}")
-    print(f"  - Credits: {len(data_credits)}")
-
-    # Check vulnerability data
-    if data_vuln:
-        print("\nOSV Vulnerability Data (osv_vulnerabilities table):")
-        print("-" * 60)
-        vuln_entry = data_vuln[0]
-        print(f"  OSV ID: {vuln_entry[0]}")
-        print(f"  Schema Version: {vuln_entry[1]}")
-        print(f"  Modified: {vuln_entry[2]}")
-        print(f"  Published: {vuln_entry[3]}")
-        print(f"  Withdrawn: {vuln_entry[4]}")
-        print(f"  Summary: {vuln_entry[5]}")
-        print(f"  Details: {vuln_entry[6][:100]}..." if vuln_entry[6] and len(vuln_entry[6]) > 100 else f"  Details: {vuln_entry[6]}")
-        print(f"  Database Specific: {vuln_entry[7]}")
-
-    # Check aliases
-    if data_aliases:
-        print("\nAliases Data (osv_aliases table):")
-        print("-" * 60)
-        for idx, alias_entry in enumerate(data_aliases, 1):
-            print(f"  Alias {idx}: OSV_ID={alias_entry[0]}, Alias={alias_entry[1]}")
-
-    # Check references
-    if data_refs:
-        print("\nReferences Data (osv_references table):")
-        print("-" * 60)
-        for idx, ref_entry in enumerate(data_refs, 1):
-            print(f"  Ref {idx}: Type={ref_entry[1]}, URL={ref_entry[2][:50]}...")
-
-    # Check severity data
-    if data_severity:
-        print("\nSeverity Data (osv_severity table):")
-        print("-" * 60)
-        for idx, sev_entry in enumerate(data_severity, 1):
-            print(f"  Severity {idx}:")
-            print(f"    OSV ID: {sev_entry[0]}")
-            print(f"    Type: {sev_entry[1]}")
-            print(f"    Score: {sev_entry[2]}")
-
-    # Check affected packages
-    if data_affected:
-        print("\nAffected Packages Data (osv_affected table):")
-        print("-" * 60)
-        for idx, aff_entry in enumerate(data_affected, 1):
-            print(f"  Package {idx}:")
-            print(f"    Ecosystem: {aff_entry[1]}")
-            print(f"    Name: {aff_entry[2]}")
-            print(f"    Purl: {aff_entry[3]}")
-            print(f"    Ranges: {aff_entry[4]}")
-            print(f"    Versions: {aff_entry[5]}")
-
-    # Check credits
-    if data_credits:
-        print("\nCredits Data (osv_credits table):")
-        print("-" * 60)
-        for idx, credit_entry in enumerate(data_credits, 1):
-            print(f"  Credit {idx}: Name={credit_entry[1]}, Type={credit_entry[3]}")
-
-    print("\n" + "=" * 60)
-    print("✓ Test completed successfully!")
-    return True
-
-if __name__ == "__main__":
-    success = test_osv_parser()
-    sys.exit(0 if success else 1)
+    logger.debug(
+        "Parser returned %d vulnerability entries, %d aliases, %d references, "
+        "%d severity entries, %d affected packages, %d credits",
+        len(data_vuln), len(data_aliases), len(data_refs),
+        len(data_severity), len(data_affected), len(data_credits)
+    )
+
+    # Check vulnerability data (osv_vulnerabilities table)
+    assert len(data_vuln) == 1
+    osv_id, schema_version, modified, published, withdrawn, summary, details, db_specific = data_vuln[0]
+    assert osv_id == "GHSA-test-osv-0001"
+    assert schema_version == "1.6.0"
+    assert modified == datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+    assert published == datetime(2025, 5, 30, 8, 0, tzinfo=timezone.utc)
+    assert withdrawn is None
+    assert summary == "Test vulnerability"
+    assert details == OSV_ENTRY["details"]
+    assert db_specific == {"severity": "HIGH"}
+
+    # Check aliases (osv_aliases table)
+    assert data_aliases == [(osv_id, "CVE-2025-0001")]
+
+    # Check references (osv_references table)
+    assert data_refs == [(osv_id, "ADVISORY", "https://example.com/advisory")]
+
+    # Check severity data (osv_severity table)
+    assert data_severity == [(osv_id, "CVSS_V3", OSV_ENTRY["severity"][0]["score"])]
+
+    # Check affected packages (osv_affected table)
+    assert len(data_affected) == 1
+    _, ecosystem, name, purl, ranges, versions, eco_specific, aff_db_specific = data_affected[0]
+    assert (ecosystem, name, purl) == ("PyPI", "example", "pkg:pypi/example")
+    assert ranges == OSV_ENTRY["affected"][0]["ranges"]
+    assert versions == ["1.0.0", "1.1.0"]
+    assert eco_specific is None
+    assert aff_db_specific is None
+
+    # Check credits (osv_credits table)
+    assert len(data_credits) == 1
+    _, credit_name, contact, credit_type = data_credits[0]
+    assert (credit_name, credit_type) == ("Finder", "FINDER")
+    assert list(contact) == ["finder@example.com"]
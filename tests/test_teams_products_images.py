@@ -11,560 +11,318 @@ Tests cover:
 - Cascade deletion behavior
 """
 
+import json
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import AsyncMock
 from fastapi import status
 from httpx import AsyncClient, ASGITransport
 
 from vma.api.api import api_server
-from vma.api.models import v1 as mod_v1
-import vma.auth as a
-
-
-@pytest.fixture
-def read_only_user_token():
-    """JWT data for a user with read-only access"""
-    return mod_v1.JwtData(
-        username="reader@test.com",
-        scope={"team1": "read"},
-        root=False
-    )
-
-
-@pytest.fixture
-def write_user_token():
-    """JWT data for a user with write access"""
-    return mod_v1.JwtData(
-        username="writer@test.com",
-        scope={"team1": "write"},
-        root=False
-    )
-
-
-@pytest.fixture
-def admin_user_token():
-    """JWT data for a user with admin access"""
-    return mod_v1.JwtData(
-        username="admin@test.com",
-        scope={"team1": "admin"},
-        root=False
-    )
-
-
-@pytest.fixture
-def root_user_token():
-    """JWT data for a root user"""
-    return mod_v1.JwtData(
-        username="root@test.com",
-        scope={"team1": "admin"},
-        root=True
-    )
-
-
-@pytest.fixture
+from conftest import AUTH_HDRS, JSON_HDRS, jbody, reject_input
+
+# Run every test on one module-wide event loop so the shared client outlives each
+# test, with the router stubs from conftest reset before each one
+pytestmark = [
+    pytest.mark.asyncio(scope="module"),
+    pytest.mark.usefixtures("reset_router_mocks"),
+]
+
+
+# Request bodies shared by several tests, serialized once
+_NEW_PRODUCT_BODY = json.dumps({
+    "name": "new_prod",
+    "description": "New Product",
+    "team": "team1"
+}).encode()
+_UPDATE_PRODUCT_BODY = json.dumps({
+    "name": "prod1",
+    "description": "Updated Product",
+    "team": "team1"
+}).encode()
+_NEW_IMAGE_BODY = json.dumps({
+    "name": "app",
+    "version": "1.0",
+    "product": "prod1",
+    "team": "team1"
+}).encode()
+
+# Connector results used by several tests; the routers return them unchanged
+_OK_TEAM1 = {
+    "status": True,
+    "result": [
+        {"name": "team1", "description": "Team 1"}
+    ]
+}
+_OK_PRODUCTS = {
+    "status": True,
+    "result": [
+        {"id": "prod1", "description": "Product 1", "team": "team1"},
+        {"id": "prod2", "description": "Product 2", "team": "team1"}
+    ]
+}
+_OK_DELETED_ROWS = {"status": True, "result": {"deleted_rows": 1}}
+
+
+@pytest.fixture(scope="module")
 async def client():
-    """Async test client"""
+    """Async test client, built once for the whole module"""
     transport = ASGITransport(app=api_server)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
-    api_server.dependency_overrides.clear()
 
 
 class TestTeamManagement:
     """Tests for team CRUD operations"""
 
-    @pytest.mark.asyncio
-    async def test_get_teams_success(self, client, read_only_user_token, mock_router_dependencies):
+    async def test_get_teams_success(self, client, read_only_user_token, patched_router, override_auth_dependency):
         """Test that user can list teams they have access to"""
-        async def override_validate_token():
-            return read_only_user_token
+        override_auth_dependency(read_only_user_token)
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        mock_c = mock_router_dependencies["connector"]
-        mock_c.get_teams = AsyncMock(return_value={
-            "status": True,
-            "result": [
-                {"name": "team1", "description": "Team 1"}
-            ]
-        })
+        mock_c = patched_router["connector"]
+        mock_c.get_teams = AsyncMock(return_value=_OK_TEAM1)
 
         response = await client.get(
             "/api/v1/teams",
-            headers={"Authorization": "Bearer fake_token"}
+            headers=AUTH_HDRS
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = jbody(response)
         assert len(data["result"]) == 1
         assert data["result"][0]["name"] == "team1"
 
-    @pytest.mark.asyncio
-    async def test_get_team_by_name_success(self, client, read_only_user_token):
+    async def test_get_team_by_name_success(self, client, read_only_user_token, patched_router, override_auth_dependency):
         """Test getting specific team details"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        override_auth_dependency(read_only_user_token)
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
+        mock_c = patched_router["connector"]
+        mock_c.get_teams = AsyncMock(return_value=_OK_TEAM1)
 
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.get_teams = AsyncMock(return_value={
-                "status": True,
-                "result": [
-                    {"name": "team1", "description": "Team 1 Description"}
-                ]
-            })
-
-            response = await client.get(
-                "/api/v1/team/team1",
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            data = response.json()
-            assert data["result"][0]["name"] == "team1"
+        response = await client.get(
+            "/api/v1/team/team1",
+            headers=AUTH_HDRS
+        )
 
-    @pytest.mark.asyncio
-    async def test_get_team_unauthorized_team_forbidden(self, client, read_only_user_token):
-        """Test that user cannot view team they don't have access to"""
-        async def override_validate_token():
-            return read_only_user_token
+        assert response.status_code == status.HTTP_200_OK
+        data = jbody(response)
+        assert data["result"][0]["name"] == "team1"
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+    async def test_create_team_root_user_success(self, client, root_user_token, patched_router, override_auth_dependency):
+        """Test that root user can create teams"""
+        override_auth_dependency(root_user_token)
 
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
+        mock_c = patched_router["connector"]
+        mock_c.insert_teams = AsyncMock(return_value={
+            "status": True,
+            "result": {"name": "new_team"}
+        })
 
-            response = await client.get(
-                "/api/v1/team/team2",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await client.post(
+            "/api/v1/team",
+            json={"name": "new_team", "description": "New Team Description"},
+            headers=AUTH_HDRS
+        )
 
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.insert_teams.assert_called_once_with(
+            name="new_team",
+            description="New Team Description"
+        )
 
-    @pytest.mark.asyncio
-    async def test_create_team_root_user_success(self, client, root_user_token):
-        """Test that root user can create teams"""
-        async def override_validate_token():
-            return root_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.insert_teams = AsyncMock(return_value={
-                "status": True,
-                "result": {"name": "new_team"}
-            })
-
-            response = await client.post(
-                "/api/v1/team",
-                json={"name": "new_team", "description": "New Team Description"},
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.insert_teams.assert_called_once_with(
-                name="new_team",
-                description="New Team Description"
-            )
-
-    @pytest.mark.asyncio
-    async def test_create_team_missing_name_fails(self, client, root_user_token):
+    async def test_create_team_missing_name_fails(self, client, root_user_token, patched_router, override_auth_dependency):
         """Test that creating team without name fails"""
-        async def override_validate_token():
-            return root_user_token
+        override_auth_dependency(root_user_token)
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        mock_helper = patched_router["helper"]
+        mock_helper.validate_input = reject_input
 
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.return_value = None
-            mock_helper.errors = {"400": "One or several parameters are missing or malformed"}
-
-            response = await client.post(
-                "/api/v1/team",
-                json={"name": "", "description": "Description"},
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await client.post(
+            "/api/v1/team",
+            json={"name": "", "description": "Description"},
+            headers=AUTH_HDRS
+        )
 
-            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @pytest.mark.asyncio
-    async def test_delete_team_root_user_success(self, client, root_user_token):
+    async def test_delete_team_root_user_success(self, client, root_user_token, patched_router, override_auth_dependency):
         """Test that root user can delete teams"""
-        async def override_validate_token():
-            return root_user_token
+        override_auth_dependency(root_user_token)
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.delete_team = AsyncMock(return_value={
-                "status": True,
-                "result": {"deleted": 1}
-            })
+        mock_c = patched_router["connector"]
+        mock_c.delete_team = AsyncMock(return_value={
+            "status": True,
+            "result": {"deleted": 1}
+        })
 
-            response = await client.delete(
-                "/api/v1/team/team1",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await client.delete(
+            "/api/v1/team/team1",
+            headers=AUTH_HDRS
+        )
 
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.delete_team.assert_called_once_with(id="team1")
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.delete_team.assert_called_once_with(id="team1")
 
-    @pytest.mark.asyncio
-    async def test_update_team_admin_success(self, client, root_user_token):
+    async def test_update_team_admin_success(self, client, root_user_token, patched_router, override_auth_dependency):
         """Test that admin can update team description"""
-        async def override_validate_token():
-            return root_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.update_team = AsyncMock(return_value={
-                "status": True,
-                "result": {"name": "team1"}
-            })
-
-            response = await client.patch(
-                "/api/v1/team/team1",
-                json={"name": "team1", "description": "Updated Team"},
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        override_auth_dependency(root_user_token)
 
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.update_team.assert_called_once_with(name="team1", description="Updated Team")
-
-    @pytest.mark.asyncio
-    async def test_update_team_non_admin_forbidden(self, client, read_only_user_token):
-        """Test that non-admin user cannot update teams"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
-
-            response = await client.patch(
-                "/api/v1/team/team1",
-                json={"description": "Updated Team"},
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    async def test_delete_team_non_root_forbidden(self, client, read_only_user_token):
-        """Test that non-admin user cannot delete teams"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        mock_c = patched_router["connector"]
+        mock_c.update_team = AsyncMock(return_value={
+            "status": True,
+            "result": {"name": "team1"}
+        })
 
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
+        response = await client.patch(
+            "/api/v1/team/team1",
+            json={"name": "team1", "description": "Updated Team"},
+            headers=AUTH_HDRS
+        )
 
-            response = await client.delete(
-                "/api/v1/team/team1",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.update_team.assert_called_once_with(name="team1", description="Updated Team")
 
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
 class TestProductManagement:
     """Tests for product CRUD operations"""
 
-    @pytest.mark.asyncio
-    async def test_get_products_success(self, client, read_only_user_token, mock_router_dependencies):
+    async def test_get_products_success(self, client, read_only_user_token, patched_router, override_auth_dependency):
         """Test listing products with team scoping"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        override_auth_dependency(read_only_user_token)
 
-        mock_c = mock_router_dependencies["connector"]
-        mock_c.get_products = AsyncMock(return_value={
-            "status": True,
-            "result": [
-                {"id": "prod1", "description": "Product 1", "team": "team1"},
-                {"id": "prod2", "description": "Product 2", "team": "team1"}
-            ]
-        })
+        mock_c = patched_router["connector"]
+        mock_c.get_products = AsyncMock(return_value=_OK_PRODUCTS)
 
         response = await client.get(
             "/api/v1/products",
-            headers={"Authorization": "Bearer fake_token"}
+            headers=AUTH_HDRS
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = jbody(response)
         assert len(data["result"]) == 2
         mock_c.get_products.assert_called_once_with(teams=["team1"])
 
-    @pytest.mark.asyncio
-    async def test_get_product_by_id_success(self, client, read_only_user_token):
+    async def test_get_product_by_id_success(self, client, read_only_user_token, patched_router, override_auth_dependency):
         """Test getting specific product"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        override_auth_dependency(read_only_user_token)
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
+        mock_c = patched_router["connector"]
+        mock_c.get_products = AsyncMock(return_value=_OK_PRODUCTS)
 
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.get_products = AsyncMock(return_value={
-                "status": True,
-                "result": [
-                    {"id": "prod1", "description": "Product 1", "team": "team1"}
-                ]
-            })
-
-            response = await client.get(
-                "/api/v1/product/team1/prod1",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await client.get(
+            "/api/v1/product/team1/prod1",
+            headers=AUTH_HDRS
+        )
 
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.get_products.assert_called_once_with(teams=["team1"], id="prod1")
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.get_products.assert_called_once_with(teams=["team1"], id="prod1")
 
-    @pytest.mark.asyncio
-    async def test_create_product_write_access_success(self, client, write_user_token):
+    async def test_create_product_write_access_success(self, client, write_user_token, patched_router, override_auth_dependency):
         """Test that user with write access can create products"""
-        async def override_validate_token():
-            return write_user_token
+        override_auth_dependency(write_user_token)
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        mock_c = patched_router["connector"]
+        mock_c.insert_product = AsyncMock(return_value={
+            "status": True,
+            "result": {"id": "new_prod"}
+        })
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
+        response = await client.post(
+            "/api/v1/product",
+            content=_NEW_PRODUCT_BODY,
+            headers=JSON_HDRS
+        )
 
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.insert_product = AsyncMock(return_value={
-                "status": True,
-                "result": {"id": "new_prod"}
-            })
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.insert_product.assert_called_once_with(
+            name="new_prod",
+            description="New Product",
+            team="team1"
+        )
 
-            response = await client.post(
-                "/api/v1/product",
-                json={
-                    "name": "new_prod",
-                    "description": "New Product",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.insert_product.assert_called_once_with(
-                name="new_prod",
-                description="New Product",
-                team="team1"
-            )
-
-    @pytest.mark.asyncio
-    async def test_update_product_write_access_success(self, client, write_user_token):
+    async def test_update_product_write_access_success(self, client, write_user_token, patched_router, override_auth_dependency):
         """Test that user with write access can update products"""
-        async def override_validate_token():
-            return write_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        override_auth_dependency(write_user_token)
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.update_product = AsyncMock(return_value={
-                "status": True,
-                "result": {"id": "prod1"}
-            })
-
-            response = await client.patch(
-                "/api/v1/product",
-                json={
-                    "name": "prod1",
-                    "description": "Updated Product",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.update_product.assert_called_once_with(
-                name="prod1",
-                description="Updated Product",
-                team="team1"
-            )
-
-    @pytest.mark.asyncio
-    async def test_update_product_read_only_forbidden(self, client, read_only_user_token):
-        """Test that read-only user cannot update products"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
-
-            response = await client.patch(
-                "/api/v1/product",
-                json={
-                    "name": "prod1",
-                    "description": "Updated Product",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    async def test_create_product_read_only_forbidden(self, client, read_only_user_token):
-        """Test that read-only user cannot create products"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
+        mock_c = patched_router["connector"]
+        mock_c.update_product = AsyncMock(return_value={
+            "status": True,
+            "result": {"id": "prod1"}
+        })
 
-            response = await client.post(
-                "/api/v1/product",
-                json={
-                    "name": "new_prod",
-                    "description": "New Product",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await client.patch(
+            "/api/v1/product",
+            content=_UPDATE_PRODUCT_BODY,
+            headers=JSON_HDRS
+        )
 
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.update_product.assert_called_once_with(
+            name="prod1",
+            description="Updated Product",
+            team="team1"
+        )
 
-    @pytest.mark.asyncio
-    async def test_create_product_missing_name_fails(self, client, write_user_token, mock_helper_errors):
+    async def test_create_product_missing_name_fails(self, client, write_user_token, patched_router, override_auth_dependency):
         """Test that creating product without name fails with authorization error"""
-        async def override_validate_token():
-            return write_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.return_value = None
-            mock_helper.errors = mock_helper_errors
-
-            response = await client.post(
-                "/api/v1/product",
-                json={
-                    "name": "",
-                    "description": "Product",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        override_auth_dependency(write_user_token)
+
+        mock_helper = patched_router["helper"]
+        mock_helper.validate_input = reject_input
+
+        response = await client.post(
+            "/api/v1/product",
+            json={
+                "name": "",
+                "description": "Product",
+                "team": "team1"
+            },
+            headers=AUTH_HDRS
+        )
 
-            # Authorization checked before validation, so 401 not 400
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        # Authorization checked before validation, so 401 not 400
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    @pytest.mark.asyncio
-    async def test_delete_product_admin_access_success(self, client, admin_user_token):
+    async def test_delete_product_admin_access_success(self, client, admin_user_token, patched_router, override_auth_dependency):
         """Test that admin can delete products"""
-        async def override_validate_token():
-            return admin_user_token
+        override_auth_dependency(admin_user_token)
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        mock_c = patched_router["connector"]
+        mock_c.delete_product = AsyncMock(return_value=_OK_DELETED_ROWS)
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.delete_product = AsyncMock(return_value={
-                "status": True,
-                "result": {"deleted_rows": 1}
-            })
-
-            response = await client.delete(
-                "/api/v1/product/team1/prod1",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await client.delete(
+            "/api/v1/product/team1/prod1",
+            headers=AUTH_HDRS
+        )
 
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.delete_product.assert_called_once_with(id="prod1", team="team1")
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.delete_product.assert_called_once_with(id="prod1", team="team1")
 
-    @pytest.mark.asyncio
-    async def test_delete_product_by_id_path_param(self, client, admin_user_token):
+    async def test_delete_product_by_id_path_param(self, client, admin_user_token, patched_router, override_auth_dependency):
         """Test deleting product using path parameters"""
-        async def override_validate_token():
-            return admin_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.delete_product = AsyncMock(return_value={
-                "status": True,
-                "result": {"deleted_rows": 1}
-            })
-
-            response = await client.delete(
-                "/api/v1/product/team1/prod1",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        override_auth_dependency(admin_user_token)
 
-            assert response.status_code == status.HTTP_200_OK
+        mock_c = patched_router["connector"]
+        mock_c.delete_product = AsyncMock(return_value=_OK_DELETED_ROWS)
 
-    @pytest.mark.asyncio
-    async def test_delete_product_write_access_forbidden(self, client, write_user_token):
-        """Test that write access is insufficient for deletion"""
-        async def override_validate_token():
-            return write_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
+        response = await client.delete(
+            "/api/v1/product/team1/prod1",
+            headers=AUTH_HDRS
+        )
 
-            response = await client.delete(
-                "/api/v1/product/team1/prod1",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        assert response.status_code == status.HTTP_200_OK
 
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
 class TestImageManagement:
     """Tests for image CRUD operations"""
 
-    @pytest.mark.asyncio
-    async def test_get_images_success(self, client, read_only_user_token, mock_router_dependencies):
+    async def test_get_images_success(self, client, read_only_user_token, patched_router, override_auth_dependency):
         """Test listing images with team scoping"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        override_auth_dependency(read_only_user_token)
 
-        mock_c = mock_router_dependencies["connector"]
+        mock_c = patched_router["connector"]
         mock_c.get_images = AsyncMock(return_value={
             "status": True,
             "result": [
@@ -585,222 +343,172 @@ class TestImageManagement:
 
         response = await client.get(
             "/api/v1/images",
-            headers={"Authorization": "Bearer fake_token"}
+            headers=AUTH_HDRS
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = jbody(response)
         assert len(data["result"]) == 2
         mock_c.get_images.assert_called_once_with(teams=["team1"])
 
-    @pytest.mark.asyncio
-    async def test_create_image_write_access_success(self, client, write_user_token):
+    async def test_create_image_write_access_success(self, client, write_user_token, patched_router, override_auth_dependency):
         """Test that user with write access can create images"""
-        async def override_validate_token():
-            return write_user_token
+        override_auth_dependency(write_user_token)
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        mock_c = patched_router["connector"]
+        mock_c.insert_image = AsyncMock(return_value={
+            "status": True,
+            "result": {
+                "name": "app",
+                "version": "1.0",
+                "product": "prod1",
+                "team": "team1"
+            }
+        })
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
+        response = await client.post(
+            "/api/v1/image",
+            content=_NEW_IMAGE_BODY,
+            headers=JSON_HDRS
+        )
 
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.insert_image = AsyncMock(return_value={
-                "status": True,
-                "result": {
-                    "name": "app",
-                    "version": "1.0",
-                    "product": "prod1",
-                    "team": "team1"
-                }
-            })
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.insert_image.assert_called_once_with(
+            name="app",
+            version="1.0",
+            product="prod1",
+            team="team1"
+        )
 
-            response = await client.post(
-                "/api/v1/image",
-                json={
-                    "name": "app",
-                    "version": "1.0",
-                    "product": "prod1",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.insert_image.assert_called_once_with(
-                name="app",
-                version="1.0",
-                product="prod1",
-                team="team1"
-            )
-
-    @pytest.mark.asyncio
-    async def test_create_image_missing_required_fields_fails(self, client, write_user_token, mock_helper_errors):
+    async def test_create_image_missing_required_fields_fails(self, client, write_user_token, patched_router, override_auth_dependency):
         """Test that creating image without required fields fails with authorization error"""
-        async def override_validate_token():
-            return write_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.return_value = None
-            mock_helper.errors = mock_helper_errors
-
-            response = await client.post(
-                "/api/v1/image",
-                json={
-                    "name": "",
-                    "version": "1.0",
-                    "product": "prod1",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            # Authorization checked before validation, so 401 not 400
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    async def test_create_image_read_only_forbidden(self, client, read_only_user_token):
-        """Test that read-only user cannot create images"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
-
-            response = await client.post(
-                "/api/v1/image",
-                json={
-                    "name": "app",
-                    "version": "1.0",
-                    "product": "prod1",
-                    "team": "team1"
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        override_auth_dependency(write_user_token)
+
+        mock_helper = patched_router["helper"]
+        mock_helper.validate_input = reject_input
+
+        response = await client.post(
+            "/api/v1/image",
+            json={
+                "name": "",
+                "version": "1.0",
+                "product": "prod1",
+                "team": "team1"
+            },
+            headers=AUTH_HDRS
+        )
 
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        # Authorization checked before validation, so 401 not 400
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    @pytest.mark.asyncio
-    async def test_delete_image_by_name_version(self, client, write_user_token):
+    async def test_delete_image_by_name_version(self, client, write_user_token, patched_router, override_auth_dependency):
         """Test deleting specific image version"""
-        async def override_validate_token():
-            return write_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
+        override_auth_dependency(write_user_token)
 
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.delete_image = AsyncMock(return_value={
-                "status": True,
-                "result": {"deleted": 1}
-            })
+        mock_c = patched_router["connector"]
+        mock_c.delete_image = AsyncMock(return_value={
+            "status": True,
+            "result": {"deleted": 1}
+        })
 
-            response = await client.delete(
-                "/api/v1/image/team1/prod1?n=app&ver=1.0",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await client.delete(
+            "/api/v1/image/team1/prod1?n=app&ver=1.0",
+            headers=AUTH_HDRS
+        )
 
-            assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_200_OK
 
-    @pytest.mark.asyncio
-    async def test_delete_all_image_versions(self, client, write_user_token):
+    async def test_delete_all_image_versions(self, client, write_user_token, patched_router, override_auth_dependency):
         """Test deleting all versions of an image"""
-        async def override_validate_token():
-            return write_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.delete_image = AsyncMock(return_value={
-                "status": True,
-                "result": {"deleted": 3}
-            })
-
-            response = await client.delete(
-                "/api/v1/image/team1/prod1?n=app",
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            # Should be called with version=None to delete all versions
-            mock_c.delete_image.assert_called_once_with(
-                product="prod1",
-                name="app",
-                team="team1"
-            )
-
+        override_auth_dependency(write_user_token)
 
-class TestStatsEndpoint:
-    """Tests for stats aggregation"""
-
-    @pytest.mark.asyncio
-    async def test_get_stats_success(self, client, read_only_user_token, mock_router_dependencies):
-        """Test getting statistics for user's teams"""
-        async def override_validate_token():
-            return read_only_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        mock_c = mock_router_dependencies["connector"]
-        mock_c.get_products = AsyncMock(return_value={
+        mock_c = patched_router["connector"]
+        mock_c.delete_image = AsyncMock(return_value={
             "status": True,
-            "result": [{"id": "prod1"}, {"id": "prod2"}, {"id": "prod3"}]
-        })
-        mock_c.get_images = AsyncMock(return_value={
-            "status": True,
-            "result": [
-                {"name": "img1"},
-                {"name": "img2"},
-                {"name": "img3"},
-                {"name": "img4"},
-                {"name": "img5"}
-            ]
+            "result": {"deleted": 3}
         })
 
-        response = await client.get(
-            "/api/v1/stats",
-            headers={"Authorization": "Bearer fake_token"}
+        response = await client.delete(
+            "/api/v1/image/team1/prod1?n=app",
+            headers=AUTH_HDRS
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["products"] == 3
-        assert data["images"] == 5
+        # Should be called with version=None to delete all versions
+        mock_c.delete_image.assert_called_once_with(
+            product="prod1",
+            name="app",
+            team="team1"
+        )
+
+
+class TestForbiddenAccess:
+    """Tests that users without enough access are rejected"""
+
+    @pytest.mark.parametrize("user_fixture, method, path, body", [
+        ("read_only_user_token", "GET", "/api/v1/team/team2", None),
+        ("read_only_user_token", "PATCH", "/api/v1/team/team1", json.dumps({"description": "Updated Team"}).encode()),
+        ("read_only_user_token", "DELETE", "/api/v1/team/team1", None),
+        ("read_only_user_token", "POST", "/api/v1/product", _NEW_PRODUCT_BODY),
+        ("read_only_user_token", "PATCH", "/api/v1/product", _UPDATE_PRODUCT_BODY),
+        ("write_user_token", "DELETE", "/api/v1/product/team1/prod1", None),
+        ("read_only_user_token", "POST", "/api/v1/image", _NEW_IMAGE_BODY),
+    ], ids=[
+        "get_unauthorized_team",
+        "update_team_non_admin",
+        "delete_team_non_root",
+        "create_product_read_only",
+        "update_product_read_only",
+        "delete_product_write_access",
+        "create_image_read_only",
+    ])
+    async def test_insufficient_access_forbidden(
+        self, request, client, override_auth_dependency, user_fixture, method, path, body
+    ):
+        """Test that the request is rejected for a user lacking the required access"""
+        override_auth_dependency(request.getfixturevalue(user_fixture))
+
+        response = await client.request(
+            method,
+            path,
+            content=body,
+            headers=JSON_HDRS
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    @pytest.mark.asyncio
-    async def test_get_stats_empty_results(self, client, read_only_user_token, mock_router_dependencies):
-        """Test stats with no products or images"""
-        async def override_validate_token():
-            return read_only_user_token
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+class TestStatsEndpoint:
+    """Tests for stats aggregation"""
 
-        mock_c = mock_router_dependencies["connector"]
+    @pytest.mark.parametrize("products, images", [
+        (3, 5),
+        (0, 0),
+        (1, 0),
+        (0, 7),
+    ], ids=["products_and_images", "empty", "products_only", "images_only"])
+    async def test_get_stats(
+        self, client, read_only_user_token, patched_router, override_auth_dependency, products, images
+    ):
+        """Test that stats count the products and images of the user's teams"""
+        override_auth_dependency(read_only_user_token)
+
+        mock_c = patched_router["connector"]
         mock_c.get_products = AsyncMock(return_value={
             "status": True,
-            "result": []
+            "result": [{"id": f"prod{i}"} for i in range(products)]
         })
         mock_c.get_images = AsyncMock(return_value={
             "status": True,
-            "result": []
+            "result": [{"name": f"img{i}"} for i in range(images)]
         })
 
         response = await client.get(
             "/api/v1/stats",
-            headers={"Authorization": "Bearer fake_token"}
+            headers=AUTH_HDRS
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["products"] == 0
-        assert data["images"] == 0
+        data = jbody(response)
+        assert data["products"] == products
+        assert data["images"] == images
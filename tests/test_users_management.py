@@ -7,694 +7,376 @@ Tests cover:
 - User retrieval (own data or admin)
 - User updates (password, scopes, root status)
 - User deletion (admin/root only)
-- Scope format validation (team:scope pairs)
 - Self-service user updates
 """
 
+import orjson
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import AsyncMock
 from fastapi import status
 from httpx import AsyncClient, ASGITransport
 
 from vma.api.api import api_server
-from vma.api.models import v1 as mod_v1
-import vma.auth as a
+from conftest import AUTH_HDRS, JSON_HDRS, jbody, none_if_empty
 
-
-@pytest.fixture
-def regular_user_token():
-    """JWT data for a regular user"""
-    return mod_v1.JwtData(
-        username="user@test.com",
-        scope={"team1": "write"},
-        root=False
-    )
+# Run every test on one module-wide event loop so the shared client outlives each
+# test, with the router stubs from conftest reset before each one
+pytestmark = [
+    pytest.mark.asyncio(scope="module"),
+    pytest.mark.usefixtures("reset_router_mocks"),
+]
 
 
-@pytest.fixture
-def admin_user_token():
-    """JWT data for an admin user"""
-    return mod_v1.JwtData(
-        username="admin@test.com",
-        scope={"team1": "admin"},
-        root=False
-    )
+# Request bodies shared by several tests, serialized once
+_NEW_USER_BODY = orjson.dumps({
+    "email": "newuser@test.com",
+    "password": "password123",
+    "name": "New User",
+    "scopes": "team1:read",
+    "root": False
+})
 
 
-@pytest.fixture
-def root_user_token():
-    """JWT data for a root user"""
-    return mod_v1.JwtData(
-        username="root@test.com",
-        scope={"team1": "admin"},
-        root=True
-    )
-
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def client():
-    """Async test client"""
+    """Async test client, built once for the whole module"""
     transport = ASGITransport(app=api_server)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
-    api_server.dependency_overrides.clear()
+
+
+@pytest.fixture
+def call_api(client, override_auth_dependency):
+    """Send a request to the API authenticated as the given user"""
+    async def _call(token, method, path, json=None, content=None):
+        override_auth_dependency(token)
+        headers = JSON_HDRS if content is not None else AUTH_HDRS
+        return await client.request(method, path, json=json, content=content, headers=headers)
+    return _call
 
 
 class TestUserCreation:
     """Tests for creating users"""
 
-    @pytest.mark.asyncio
-    async def test_create_user_admin_success(self, client, admin_user_token):
+    async def test_create_user_admin_success(self, call_api, admin_user_token, patched_router):
         """Test that admin can create users in their team"""
-        async def override_validate_token():
-            return admin_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.a.hasher") as mock_hasher, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.validate_scopes.return_value = {"team1": "read"}
-            mock_hasher.hash.return_value = "hashed_password"
-            mock_c.insert_users = AsyncMock(return_value={
-                "status": True,
-                "result": {"user": "newuser@test.com"}
-            })
-
-            response = await client.post(
-                "/api/v1/user",
-                json={
-                    "email": "newuser@test.com",
-                    "password": "password123",
-                    "name": "New User",
-                    "scopes": "team1:read",
-                    "root": False
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        mock_c = patched_router["connector"]
+        mock_helper = patched_router["helper"]
+        mock_helper.scopes = {"team1": "read"}
+        mock_c.insert_users = AsyncMock(return_value={
+            "status": True,
+            "result": {"user": "newuser@test.com"}
+        })
 
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.insert_users.assert_called_once()
-
-            # Verify password was hashed
-            call_args = mock_c.insert_users.call_args
-            assert call_args[1]["password"] == "hashed_password"
-
-    @pytest.mark.asyncio
-    async def test_create_user_multiple_teams(self, client, root_user_token):
-        """Test creating user with access to multiple teams"""
-        async def override_validate_token():
-            return root_user_token
+        response = await call_api(admin_user_token, "POST", "/api/v1/user", content=_NEW_USER_BODY)
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.insert_users.assert_called_once()
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.a.hasher") as mock_hasher, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
+        # Verify password was hashed
+        assert mock_c.insert_users.call_args.kwargs["password"] == "hashed_password123"
 
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.validate_scopes.return_value = {
-                "team1": "admin",
-                "team2": "write",
-                "team3": "read"
+    async def test_create_user_multiple_teams(self, call_api, root_user_token, patched_router):
+        """Test creating user with access to multiple teams"""
+        mock_c = patched_router["connector"]
+        mock_helper = patched_router["helper"]
+        mock_helper.scopes = {
+            "team1": "admin",
+            "team2": "write",
+            "team3": "read"
+        }
+        # Mock get_teams for root user authorization
+        mock_c.get_teams = AsyncMock(return_value={
+            "status": True,
+            "result": [
+                {"name": "team1"},
+                {"name": "team2"},
+                {"name": "team3"}
+            ]
+        })
+        mock_c.insert_users = AsyncMock(return_value={
+            "status": True,
+            "result": {"user": "multiuser@test.com"}
+        })
+
+        response = await call_api(
+            root_user_token, "POST", "/api/v1/user",
+            json={
+                "email": "multiuser@test.com",
+                "password": "password123",
+                "name": "Multi Team User",
+                "scopes": "team1:admin,team2:write,team3:read",
+                "root": False
             }
-            mock_hasher.hash.return_value = "hashed_password"
-            # Mock get_teams for root user authorization
-            mock_c.get_teams = AsyncMock(return_value={
-                "status": True,
-                "result": [
-                    {"name": "team1"},
-                    {"name": "team2"},
-                    {"name": "team3"}
-                ]
-            })
-            mock_c.insert_users = AsyncMock(return_value={
-                "status": True,
-                "result": {"user": "multiuser@test.com"}
-            })
-
-            response = await client.post(
-                "/api/v1/user",
-                json={
-                    "email": "multiuser@test.com",
-                    "password": "password123",
-                    "name": "Multi Team User",
-                    "scopes": "team1:admin,team2:write,team3:read",
-                    "root": False
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-
-    @pytest.mark.asyncio
-    async def test_create_user_non_admin_forbidden(self, client, regular_user_token):
-        """Test that non-admin user cannot create users"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.validate_scopes.return_value = {"team1": "read"}
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
-
-            response = await client.post(
-                "/api/v1/user",
-                json={
-                    "email": "newuser@test.com",
-                    "password": "password123",
-                    "name": "New User",
-                    "scopes": "team1:read",
-                    "root": False
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    async def test_create_user_missing_email_fails(self, client, admin_user_token):
-        """Test that creating user without email fails"""
-        async def override_validate_token():
-            return admin_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.return_value = None
-            mock_helper.validate_scopes.return_value = {"team1": "read"}
-            mock_helper.errors = {"400": "One or several parameters are missing or malformed"}
-
-            response = await client.post(
-                "/api/v1/user",
-                json={
-                    "email": "",
-                    "password": "password123",
-                    "name": "User",
-                    "scopes": "team1:read",
-                    "root": False
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_400_BAD_REQUEST
-
-    @pytest.mark.asyncio
-    async def test_create_user_missing_password_fails(self, client, admin_user_token):
-        """Test that creating user without password fails"""
-        async def override_validate_token():
-            return admin_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x if x else None
-            mock_helper.validate_scopes.return_value = {"team1": "read"}
-            mock_helper.errors = {"400": "One or several parameters are missing or malformed"}
-
-            response = await client.post(
-                "/api/v1/user",
-                json={
-                    "email": "user@test.com",
-                    "password": "",
-                    "name": "User",
-                    "scopes": "team1:read",
-                    "root": False
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_400_BAD_REQUEST
-
-    @pytest.mark.asyncio
-    async def test_create_user_invalid_scopes_fails(self, client, admin_user_token):
-        """Test that creating user with invalid scopes fails"""
-        async def override_validate_token():
-            return admin_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.validate_scopes.return_value = None
-            mock_helper.errors = {"400": "One or several parameters are missing or malformed"}
-
-            response = await client.post(
-                "/api/v1/user",
-                json={
-                    "email": "user@test.com",
-                    "password": "password",
-                    "name": "User",
-                    "scopes": "",
-                    "root": False
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("user_fixture, body, none_on_empty, scopes, expected_status", [
+        ("regular_user_token", _NEW_USER_BODY, False, {"team1": "read"}, status.HTTP_401_UNAUTHORIZED),
+        ("admin_user_token", orjson.dumps({
+            "email": "",
+            "password": "password123",
+            "name": "User",
+            "scopes": "team1:read",
+            "root": False
+        }), True, {"team1": "read"}, status.HTTP_400_BAD_REQUEST),
+        ("admin_user_token", orjson.dumps({
+            "email": "user@test.com",
+            "password": "",
+            "name": "User",
+            "scopes": "team1:read",
+            "root": False
+        }), True, {"team1": "read"}, status.HTTP_400_BAD_REQUEST),
+        ("admin_user_token", orjson.dumps({
+            "email": "user@test.com",
+            "password": "password",
+            "name": "User",
+            "scopes": "",
+            "root": False
+        }), False, None, status.HTTP_400_BAD_REQUEST),
+    ], ids=["non_admin_forbidden", "missing_email_fails", "missing_password_fails", "invalid_scopes_fails"])
+    async def test_create_user_rejected(
+        self, request, call_api, patched_router,
+        user_fixture, body, none_on_empty, scopes, expected_status
+    ):
+        """Test that user creation is rejected for non-admins and for missing fields or scopes"""
+        mock_helper = patched_router["helper"]
+        if none_on_empty:
+            mock_helper.validate_input = none_if_empty
+        mock_helper.scopes = scopes
+
+        response = await call_api(request.getfixturevalue(user_fixture), "POST", "/api/v1/user", content=body)
+
+        assert response.status_code == expected_status
 
 
 class TestUserRetrieval:
     """Tests for retrieving user information"""
 
-    @pytest.mark.asyncio
-    async def test_list_users_admin_success(self, client, admin_user_token):
+    async def test_list_users_admin_success(self, call_api, admin_user_token, patched_router):
         """Test that admin can list users"""
-        async def override_validate_token():
-            return admin_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c:
-            mock_c.get_users = AsyncMock(return_value={
-                "status": True,
-                "result": [
-                    {
-                        "email": "user1@test.com",
-                        "name": "User 1",
-                        "is_root": False,
-                        "scope": {"team1": "read"}
-                    },
-                    {
-                        "email": "user2@test.com",
-                        "name": "User 2",
-                        "is_root": False,
-                        "scope": {"team1": "write"}
-                    }
-                ]
-            })
-
-            response = await client.get(
-                "/api/v1/users",
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            data = response.json()
-            assert len(data["result"]) == 2
-
-    @pytest.mark.asyncio
-    async def test_list_users_non_admin_forbidden(self, client, regular_user_token):
+        mock_c = patched_router["connector"]
+        mock_c.get_users = AsyncMock(return_value={
+            "status": True,
+            "result": [
+                {
+                    "email": "user1@test.com",
+                    "name": "User 1",
+                    "is_root": False,
+                    "scope": {"team1": "read"}
+                },
+                {
+                    "email": "user2@test.com",
+                    "name": "User 2",
+                    "is_root": False,
+                    "scope": {"team1": "write"}
+                }
+            ]
+        })
+
+        response = await call_api(admin_user_token, "GET", "/api/v1/users")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = jbody(response)
+        assert len(data["result"]) == 2
+
+    async def test_list_users_non_admin_forbidden(self, call_api, regular_user_token):
         """Test that non-admin user cannot list users"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        response = await call_api(regular_user_token, "GET", "/api/v1/users")
 
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-            response = await client.get(
-                "/api/v1/users",
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    async def test_get_user_own_data_success(self, client, regular_user_token):
+    async def test_get_user_own_data_success(self, call_api, regular_user_token, patched_router):
         """Test that user can retrieve their own data"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.get_users = AsyncMock(return_value={
-                "status": True,
-                "result": [
-                    {
-                        "email": "user@test.com",
-                        "name": "Test User",
-                        "is_root": False,
-                        "scope": {"team1": "write"}
-                    }
-                ]
-            })
-
-            response = await client.get(
-                "/api/v1/user/user@test.com",
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            data = response.json()
-            assert data["result"][0]["email"] == "user@test.com"
-
-    @pytest.mark.asyncio
-    async def test_get_user_other_user_forbidden(self, client, regular_user_token):
-        """Test that user cannot retrieve other user's data"""
-        async def override_validate_token():
-            return regular_user_token
+        mock_c = patched_router["connector"]
+        mock_c.get_users = AsyncMock(return_value={
+            "status": True,
+            "result": [
+                {
+                    "email": "user@test.com",
+                    "name": "Test User",
+                    "is_root": False,
+                    "scope": {"team1": "write"}
+                }
+            ]
+        })
 
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        response = await call_api(regular_user_token, "GET", "/api/v1/user/user@test.com")
 
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
+        assert response.status_code == status.HTTP_200_OK
+        data = jbody(response)
+        assert data["result"][0]["email"] == "user@test.com"
 
-            response = await client.get(
-                "/api/v1/user/other@test.com",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+    async def test_get_user_other_user_forbidden(self, call_api, regular_user_token):
+        """Test that user cannot retrieve other user's data"""
+        response = await call_api(regular_user_token, "GET", "/api/v1/user/other@test.com")
 
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    @pytest.mark.asyncio
-    async def test_get_user_root_can_see_all(self, client, root_user_token):
+    async def test_get_user_root_can_see_all(self, call_api, root_user_token, patched_router):
         """Test that root user can retrieve any user's data"""
-        async def override_validate_token():
-            return root_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.get_users = AsyncMock(return_value={
-                "status": True,
-                "result": [
-                    {
-                        "email": "other@test.com",
-                        "name": "Other User",
-                        "is_root": False,
-                        "scope": {"team2": "admin"}
-                    }
-                ]
-            })
+        mock_c = patched_router["connector"]
+        mock_c.get_users = AsyncMock(return_value={
+            "status": True,
+            "result": [
+                {
+                    "email": "other@test.com",
+                    "name": "Other User",
+                    "is_root": False,
+                    "scope": {"team2": "admin"}
+                }
+            ]
+        })
 
-            response = await client.get(
-                "/api/v1/user/other@test.com",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        response = await call_api(root_user_token, "GET", "/api/v1/user/other@test.com")
 
-            assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_200_OK
 
 
 class TestUserUpdate:
     """Tests for updating user information"""
 
-    @pytest.mark.asyncio
-    async def test_update_own_password_success(self, client, regular_user_token):
+    async def test_update_own_password_success(self, call_api, regular_user_token, patched_router):
         """Test that user can update their own password"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.a.hasher") as mock_hasher, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_hasher.hash.return_value = "new_hashed_password"
-            mock_c.update_users = AsyncMock(return_value={
-                "status": True,
-                "result": {"updated": 1}
-            })
-
-            response = await client.patch(
-                "/api/v1/user",
-                json={
-                    "email": "user@test.com",
-                    "password": "new_password",
-                    "name": None,
-                    "scopes": None,
-                    "root": None
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            mock_hasher.hash.assert_called_once_with("new_password")
-
-    @pytest.mark.asyncio
-    async def test_update_own_name_success(self, client, regular_user_token):
-        """Test that user can update their own name"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.update_users = AsyncMock(return_value={
-                "status": True,
-                "result": {"updated": 1}
-            })
-
-            response = await client.patch(
-                "/api/v1/user",
-                json={
-                    "email": "user@test.com",
-                    "password": None,
-                    "name": "Updated Name",
-                    "scopes": None,
-                    "root": None
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        mock_c = patched_router["connector"]
+        mock_hasher = patched_router["hasher"]
+        mock_c.update_users = AsyncMock(return_value={
+            "status": True,
+            "result": {"updated": 1}
+        })
+
+        response = await call_api(
+            regular_user_token, "PATCH", "/api/v1/user",
+            json={
+                "email": "user@test.com",
+                "password": "new_password",
+                "name": None,
+                "scopes": None,
+                "root": None
+            }
+        )
 
-            assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_hasher.hashed == ["new_password"]
 
-    @pytest.mark.asyncio
-    async def test_update_other_user_non_root_forbidden(self, client, regular_user_token):
+    async def test_update_other_user_non_root_forbidden(self, call_api, regular_user_token):
         """Test that non-root user cannot update other users"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
-
-            response = await client.patch(
-                "/api/v1/user",
-                json={
-                    "email": "other@test.com",
-                    "password": "new_password",
-                    "name": None,
-                    "scopes": None,
-                    "root": None
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    async def test_update_user_scopes_root_success(self, client, root_user_token):
-        """Test that root can update user scopes"""
-        async def override_validate_token():
-            return root_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.validate_scopes.return_value = {"team1": "admin", "team2": "write"}
-            mock_c.update_users = AsyncMock(return_value={
-                "status": True,
-                "result": {"updated": 1}
-            })
-
-            response = await client.patch(
-                "/api/v1/user",
-                json={
-                    "email": "other@test.com",
-                    "password": None,
-                    "name": None,
-                    "scopes": "team1:admin,team2:write",
-                    "root": None
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-
-    @pytest.mark.asyncio
-    async def test_update_user_root_status_root_success(self, client, root_user_token):
-        """Test that root can update user root status"""
-        async def override_validate_token():
-            return root_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.update_users = AsyncMock(return_value={
-                "status": True,
-                "result": {"updated": 1}
-            })
-
-            response = await client.patch(
-                "/api/v1/user",
-                json={
-                    "email": "other@test.com",
-                    "password": None,
-                    "name": None,
-                    "scopes": None,
-                    "root": True
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-
-    @pytest.mark.asyncio
-    async def test_update_user_empty_password_not_changed(self, client, regular_user_token):
+        response = await call_api(
+            regular_user_token, "PATCH", "/api/v1/user",
+            json={
+                "email": "other@test.com",
+                "password": "new_password",
+                "name": None,
+                "scopes": None,
+                "root": None
+            }
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.parametrize("user_fixture, body, scopes", [
+        ("regular_user_token", orjson.dumps({
+            "email": "user@test.com",
+            "password": None,
+            "name": "Updated Name",
+            "scopes": None,
+            "root": None
+        }), None),
+        ("root_user_token", orjson.dumps({
+            "email": "other@test.com",
+            "password": None,
+            "name": None,
+            "scopes": "team1:admin,team2:write",
+            "root": None
+        }), {"team1": "admin", "team2": "write"}),
+        ("root_user_token", orjson.dumps({
+            "email": "other@test.com",
+            "password": None,
+            "name": None,
+            "scopes": None,
+            "root": True
+        }), None),
+    ], ids=["own_name", "scopes_by_root", "root_status_by_root"])
+    async def test_update_user_success(
+        self, request, call_api, patched_router, user_fixture, body, scopes
+    ):
+        """Test that users can update their own name and root can update scopes and root status"""
+        mock_c = patched_router["connector"]
+        mock_helper = patched_router["helper"]
+        mock_helper.scopes = scopes
+        mock_c.update_users = AsyncMock(return_value={
+            "status": True,
+            "result": {"updated": 1}
+        })
+
+        response = await call_api(request.getfixturevalue(user_fixture), "PATCH", "/api/v1/user", content=body)
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.update_users.assert_called_once()
+
+    async def test_update_user_empty_password_not_changed(self, call_api, regular_user_token, patched_router):
         """Test that empty password doesn't change password"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.a.hasher") as mock_hasher, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x if x else None
-            mock_c.update_users = AsyncMock(return_value={
-                "status": True,
-                "result": {"updated": 1}
-            })
-
-            response = await client.patch(
-                "/api/v1/user",
-                json={
-                    "email": "user@test.com",
-                    "password": "",
-                    "name": "Updated Name",
-                    "scopes": None,
-                    "root": None
-                },
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        mock_c = patched_router["connector"]
+        mock_hasher = patched_router["hasher"]
+        mock_helper = patched_router["helper"]
+        mock_helper.validate_input = none_if_empty
+        mock_c.update_users = AsyncMock(return_value={
+            "status": True,
+            "result": {"updated": 1}
+        })
+
+        response = await call_api(
+            regular_user_token, "PATCH", "/api/v1/user",
+            json={
+                "email": "user@test.com",
+                "password": "",
+                "name": "Updated Name",
+                "scopes": None,
+                "root": None
+            }
+        )
 
-            assert response.status_code == status.HTTP_200_OK
-            # Password hash should not be called
-            mock_hasher.hash.assert_not_called()
+        assert response.status_code == status.HTTP_200_OK
+        # Password hash should not be called
+        assert mock_hasher.hashed == []
 
 
 class TestUserDeletion:
     """Tests for deleting users"""
 
-    @pytest.mark.asyncio
-    async def test_delete_user_admin_success(self, client, admin_user_token):
+    async def test_delete_user_admin_success(self, call_api, admin_user_token, patched_router):
         """Test that admin can delete users in their team"""
-        async def override_validate_token():
-            return admin_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
+        mock_c = patched_router["connector"]
+        mock_c.delete_user = AsyncMock(return_value={
+            "status": True,
+            "result": {"deleted": 1}
+        })
 
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
+        response = await call_api(admin_user_token, "DELETE", "/api/v1/user/user@test.com")
 
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_c.delete_user = AsyncMock(return_value={
-                "status": True,
-                "result": {"deleted": 1}
-            })
+        assert response.status_code == status.HTTP_200_OK
+        mock_c.delete_user.assert_called_once_with(email="user@test.com")
 
-            response = await client.delete(
-                "/api/v1/user/user@test.com",
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-            mock_c.delete_user.assert_called_once_with(email="user@test.com")
-
-    @pytest.mark.asyncio
-    async def test_delete_user_non_admin_forbidden(self, client, regular_user_token):
+    async def test_delete_user_non_admin_forbidden(self, call_api, regular_user_token):
         """Test that non-admin user cannot delete users"""
-        async def override_validate_token():
-            return regular_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.helper") as mock_helper:
-            mock_helper.validate_input.side_effect = lambda x: x
-            mock_helper.errors = {"401": "user is not authorized to perform this action"}
+        response = await call_api(regular_user_token, "DELETE", "/api/v1/user/other@test.com")
 
-            response = await client.delete(
-                "/api/v1/user/other@test.com",
-                headers={"Authorization": "Bearer fake_token"}
-            )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-            assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-    @pytest.mark.asyncio
-    async def test_delete_user_root_can_delete_any(self, client, root_user_token):
+    async def test_delete_user_root_can_delete_any(self, call_api, root_user_token, patched_router):
         """Test that root user can delete any user"""
-        async def override_validate_token():
-            return root_user_token
-
-        api_server.dependency_overrides[a.validate_access_token] = override_validate_token
-
-        with patch("vma.api.routers.v1.c") as mock_c, \
-             patch("vma.api.routers.v1.helper") as mock_helper:
-
-            mock_helper.validate_input.side_effect = lambda x: x
-            # Mock get_teams for root user authorization
-            mock_c.get_teams = AsyncMock(return_value={
-                "status": True,
-                "result": [{"name": "team1"}]
-            })
-            mock_c.delete_user = AsyncMock(return_value={
-                "status": True,
-                "result": {"deleted": 1}
-            })
-
-            response = await client.delete(
-                "/api/v1/user/any@test.com",
-                headers={"Authorization": "Bearer fake_token"}
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-
-
-class TestScopeValidation:
-    """Tests for scope string validation"""
-
-    def test_validate_scopes_single_team(self):
-        """Test parsing single team scope"""
-        from vma.helper import validate_scopes
-
-        result = validate_scopes("team1:read")
-        assert result == {"team1": "read"}
-
-    def test_validate_scopes_multiple_teams(self):
-        """Test parsing multiple team scopes"""
-        from vma.helper import validate_scopes
-
-        result = validate_scopes("team1:admin,team2:write,team3:read")
-        assert result == {"team1": "admin", "team2": "write", "team3": "read"}
-
-    def test_validate_scopes_empty_string(self):
-        """Test that empty scope string returns None"""
-        from vma.helper import validate_scopes
-
-        result = validate_scopes("")
-        assert result is None
-
-    def test_validate_scopes_none(self):
-        """Test that None scope returns None"""
-        from vma.helper import validate_scopes
-
-        result = validate_scopes(None)
-        assert result is None
+        # Mock get_teams for root user authorization
+        mock_c = patched_router["connector"]
+        mock_c.get_teams = AsyncMock(return_value={
+            "status": True,
+            "result": [{"name": "team1"}]
+        })
+        mock_c.delete_user = AsyncMock(return_value={
+            "status": True,
+            "result": {"deleted": 1}
+        })
+
+        response = await call_api(root_user_token, "DELETE", "/api/v1/user/any@test.com")
+
+        assert response.status_code == status.HTTP_200_OK